@@ -1,11 +1,15 @@
-"""Flask application entry point - kept for backward compatibility."""
+"""Flask application entry point - kept for backward compatibility.
+
+Runs the development server; production uses Gunicorn (see gunicorn_config.py).
+"""
 
 # Import the actual Flask app from api.py
 from api import app
 
 if __name__ == "__main__":
-    from models import db
+    from alembic import command
+    from alembic.config import Config
 
-    with app.app_context():
-        db.create_all()
+    # Same schema as production: apply the migrations (see migrations/)
+    command.upgrade(Config("alembic.ini"), "head")
     app.run(host="0.0.0.0", port=5000, debug=True)
@@ -1,19 +1,42 @@
 """Authentication utilities and decorators."""
 import os
+import time
 from datetime import datetime, timedelta, timezone
 from functools import wraps
 from typing import Any, Callable, Dict, Optional, TypeVar, cast
 
 import jwt
-from flask import jsonify, request
+from flask import g, jsonify, request
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import make_transient_to_detached
 
+from cache import TTLCache
+from instrumentation import phase
 from models import User, db
+from replica import reading_from_replica, use_primary
 
 F = TypeVar("F", bound=Callable[..., Any])
 
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key")
 TOKEN_EXPIRATION_HOURS = 24
 
+# Authenticated users are cached per process so protected requests can skip
+# the user lookup. Updates made through this process invalidate the entry
+# immediately; the TTL bounds staleness for changes made elsewhere.
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
+
+user_cache: TTLCache[int, User] = TTLCache(USER_CACHE_MAX_SIZE, USER_CACHE_TTL_SECONDS)
+
+# Verified token payloads, keyed by the raw token, so the same bearer token
+# is only verified once. Entries never outlive the token's own expiry.
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+TOKEN_CACHE_MAX_SIZE = int(os.getenv("TOKEN_CACHE_MAX_SIZE", "10000"))
+
+token_cache: TTLCache[str, Dict[str, Any]] = TTLCache(
+    TOKEN_CACHE_MAX_SIZE, TOKEN_CACHE_TTL_SECONDS
+)
+
 
 def generate_token(user_id: int) -> str:
     """Generate JWT token for user."""
@@ -27,37 +50,109 @@ def generate_token(user_id: int) -> str:
 
 
 def decode_token(token: str) -> Optional[Dict[str, Any]]:
-    """Decode JWT token."""
+    """Decode JWT token.
+
+    Verified payloads are served from ``token_cache`` until the token
+    expires; invalid tokens are never cached.
+    """
+    cached = token_cache.get(token)
+    if cached is not None:
+        return dict(cached)
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
-        return cast(Dict[str, Any], payload)
+        payload = cast(
+            Dict[str, Any], jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
+        )
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
 
+    expires_in = payload["exp"] - time.time() if "exp" in payload else None
+    token_cache.set(token, dict(payload), ttl=expires_in)
+    return payload
+
 
 def get_current_user() -> Optional[User]:
-    """Get current user from request token."""
+    """Get current user from request token.
+
+    Handlers marked with ``query_token_auth`` also accept the token in the
+    ``access_token`` query parameter.
+    """
     auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
+    if auth_header and auth_header.startswith("Bearer "):
+        token = auth_header.split(" ")[1]
+    elif g.get("query_token_auth", False) and request.args.get("access_token"):
+        token = request.args["access_token"]
+    else:
         return None
 
-    token = auth_header.split(" ")[1]
     payload = decode_token(token)
     if not payload:
         return None
 
-    user = db.session.get(User, payload["user_id"])
+    g.current_user_id = payload["user_id"]
+    return load_user(payload["user_id"])
+
+
+def load_user(user_id: int) -> Optional[User]:
+    """Load a user by id, serving repeat lookups from ``user_cache``.
+
+    The cache holds detached snapshots; a hit is merged into the current
+    session without emitting SQL, so callers get an ordinary persistent
+    instance either way.
+    """
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return cast(User, db.session.merge(cached, load=False))
+
+    user = db.session.get(User, user_id)
+    if user is None and reading_from_replica():
+        # A user who just registered may not have reached the replica yet
+        with use_primary():
+            user = db.session.get(User, user_id)
+    if user is not None:
+        user_cache.set(user_id, _detached_snapshot(user))
     return user
 
 
+def _detached_snapshot(user: User) -> User:
+    """Copy the column values of ``user`` into a new detached instance."""
+    columns = inspect(User).column_attrs
+    snapshot = User(**{attr.key: getattr(user, attr.key) for attr in columns})
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(_mapper: Any, _connection: Any, target: User) -> None:
+    """Evict a user from ``user_cache`` whenever its row changes."""
+    user_cache.delete(target.id)
+
+
+def query_token_auth(f: F) -> F:
+    """Decorator letting ``login_required`` take the token from the query string.
+
+    For clients that cannot set headers, such as browser ``EventSource``;
+    query strings end up in access logs, so use it only where needed.
+    """
+
+    @wraps(f)
+    def decorated_function(*args: Any, **kwargs: Any) -> Any:
+        g.query_token_auth = True
+        return f(*args, **kwargs)
+
+    return cast(F, decorated_function)
+
+
 def login_required(f: F) -> F:
     """Decorator to require authentication."""
 
     @wraps(f)
     def decorated_function(*args: Any, **kwargs: Any) -> Any:
-        user = get_current_user()
+        with phase("auth"):
+            user = get_current_user()
         if not user:
             return jsonify({"error": "Authentication required"}), 401
         return f(*args, **kwargs, current_user=user)
@@ -0,0 +1,105 @@
+"""Microbenchmark: encoding a 10k-todo ``GET /api/todos`` response.
+
+Times building the todo dicts and encoding the response, comparing Flask's
+default provider (with datetimes formatted in ``to_dict`` as before) against
+``FastJSONProvider`` on both of its encoders. Run from ``backend/``::
+
+    python -m benchmarks.bench_json [--todos 10000] [--repeat 20]
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from json_provider import HAS_ORJSON, FastJSONProvider
+from models import Todo, User
+
+
+def build_todos(count: int) -> List[Todo]:
+    """Build ``count`` transient todos sharing one owner, without a database."""
+    start = datetime(2024, 1, 1, 9, 30, 15, 123456)
+    owner = User(id=1, username="bench", email="bench@example.com", created_at=start)
+    todos = []
+    for i in range(count):
+        importance, urgency = i % 4 + 1, (i // 4) % 4 + 1
+        todos.append(
+            Todo(
+                id=i + 1,
+                title=f"Todo {i}",
+                description="Benchmark todo " * 4,
+                status="pending",
+                importance=importance,
+                urgency=urgency,
+                priority_score=importance * 0.6 + urgency * 0.4,
+                created_at=start + timedelta(seconds=i),
+                updated_at=start + timedelta(seconds=2 * i),
+                owner=owner,
+            )
+        )
+    return todos
+
+
+def legacy_to_dict(todo: Todo) -> Dict[str, Any]:
+    """``Todo.to_dict`` as it was before, with datetimes formatted inline."""
+    data = todo.to_dict()
+    data["created_at"] = data["created_at"].isoformat()
+    data["updated_at"] = data["updated_at"].isoformat()
+    data["owner"]["created_at"] = data["owner"]["created_at"].isoformat()
+    return data
+
+
+def measure(encode: Callable[[], Any], repeat: int) -> List[float]:
+    """Time ``encode`` ``repeat`` times after one warm-up call."""
+    encode()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        encode()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--todos", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    todos = build_todos(args.todos)
+
+    default = DefaultJSONProvider(app)
+    stdlib = FastJSONProvider(app)
+    stdlib.use_orjson = False
+    cases: Dict[str, Callable[[], Any]] = {
+        "flask default, isoformat()": lambda: default.response(
+            {"todos": [legacy_to_dict(todo) for todo in todos], "next_cursor": None}
+        ),
+        "fast provider, stdlib": lambda: stdlib.response(
+            {"todos": [todo.to_dict() for todo in todos], "next_cursor": None}
+        ),
+    }
+    if HAS_ORJSON:
+        fast = FastJSONProvider(app)
+        cases["fast provider, orjson"] = lambda: fast.response(
+            {"todos": [todo.to_dict() for todo in todos], "next_cursor": None}
+        )
+    else:
+        print("orjson is not installed; only the stdlib fallback is measured")
+
+    with app.app_context():
+        results = {name: measure(encode, args.repeat) for name, encode in cases.items()}
+
+    baseline = statistics.median(next(iter(results.values())))
+    print(f"{args.todos} todos, median of {args.repeat} runs")
+    for name, timings in results.items():
+        median = statistics.median(timings)
+        print(f"  {name:<32} {median * 1000:8.2f} ms  {baseline / median:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Microbenchmark: per-row cost of serializing a 10k-todo list.
+
+Compares ``Todo.to_dict`` as it was (level label and icon tables rebuilt on
+every lookup, four lookups per row) with the current ``to_dict`` on the
+shared read-only tables, and with ``serialize_todo_row`` fed plain tuples
+and one shared owner dict. Encoding is left out; see ``bench_json`` for
+that. Run from ``backend/``::
+
+    python -m benchmarks.bench_serialize [--todos 10000] [--repeat 20]
+"""
+import argparse
+import statistics
+from typing import Any, Callable, Dict, List
+
+from benchmarks.bench_json import build_todos, measure
+from models import DEFAULT_LEVEL_ICON, LEVEL_ICONS, Todo, serialize_todo_row
+
+
+def rebuilt_level_name(level: int) -> str:
+    """``Todo.get_level_name`` as it was, building its table per call."""
+    levels = {1: "Low", 2: "Medium", 3: "High", 4: "Critical"}
+    return levels.get(level, "Medium")
+
+
+# The old table's values were string constants, so only the dict was built
+# per call; these names stand in for the literals
+ICON_LOW, ICON_MEDIUM, ICON_HIGH, ICON_CRITICAL = (LEVEL_ICONS[i] for i in range(1, 5))
+
+
+def rebuilt_level_icon(level: int) -> str:
+    """``Todo.get_level_icon`` as it was, building its table per call."""
+    icons = {1: ICON_LOW, 2: ICON_MEDIUM, 3: ICON_HIGH, 4: ICON_CRITICAL}
+    return icons.get(level, DEFAULT_LEVEL_ICON)
+
+
+def rebuilt_tables_to_dict(todo: Todo) -> Dict[str, Any]:
+    """``Todo.to_dict`` (full view) as it was before the shared tables."""
+    data: Dict[str, Any] = {
+        "id": todo.id,
+        "title": todo.title,
+        "description": todo.description,
+        "status": todo.status,
+        "importance": todo.importance,
+        "urgency": todo.urgency,
+        "priority_score": todo.priority_score,
+        "created_at": todo.created_at,
+        "updated_at": todo.updated_at,
+    }
+    data["owner"] = todo.owner.to_dict() if todo.owner else None
+    data["importance_label"] = rebuilt_level_name(todo.importance)
+    data["urgency_label"] = rebuilt_level_name(todo.urgency)
+    data["importance_icon"] = rebuilt_level_icon(todo.importance)
+    data["urgency_icon"] = rebuilt_level_icon(todo.urgency)
+    return data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--todos", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    todos = build_todos(args.todos)
+    rows = [
+        (
+            todo.id,
+            todo.title,
+            todo.description,
+            todo.status,
+            todo.importance,
+            todo.urgency,
+            todo.priority_score,
+            todo.created_at,
+            todo.updated_at,
+        )
+        for todo in todos
+    ]
+    owner = todos[0].owner.to_dict()
+    assert rebuilt_tables_to_dict(todos[0]) == serialize_todo_row(rows[0], owner)
+
+    cases: Dict[str, Callable[[], List[Dict[str, Any]]]] = {
+        "to_dict, tables per call": lambda: [
+            rebuilt_tables_to_dict(todo) for todo in todos
+        ],
+        "to_dict, shared tables": lambda: [todo.to_dict() for todo in todos],
+        "serialize_todo_row": lambda: [serialize_todo_row(row, owner) for row in rows],
+    }
+    results = {
+        name: measure(serialize, args.repeat) for name, serialize in cases.items()
+    }
+
+    baseline = statistics.median(next(iter(results.values())))
+    print(f"{args.todos} todos, median of {args.repeat} runs")
+    for name, timings in results.items():
+        median = statistics.median(timings)
+        per_row = median / args.todos * 1_000_000
+        print(
+            f"  {name:<26} {median * 1000:8.2f} ms  {per_row:6.2f} us/row"
+            f"  {baseline / median:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Compare two ``bench_api`` result files, e.g. before and after a change.
+
+Run from ``backend/``::
+
+    python -m benchmarks.compare benchmarks/results/OLD.json benchmarks/results/NEW.json
+"""
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+METRICS = ("throughput_rps", "p50_ms", "p99_ms")
+
+
+def change(old: float, new: float) -> str:
+    """Relative change from ``old`` to ``new`` as a signed percentage."""
+    if not old:
+        return "n/a"
+    return f"{(new - old) / old * 100:+.1f}%"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("old", type=Path)
+    parser.add_argument("new", type=Path)
+    args = parser.parse_args()
+
+    old: Dict[str, Any] = json.loads(args.old.read_text())
+    new: Dict[str, Any] = json.loads(args.new.read_text())
+    for label, report in (("old", old), ("new", new)):
+        meta = report["meta"]
+        dirty = " (dirty)" if meta.get("dirty") else ""
+        print(f"{label}: {meta.get('commit')}{dirty} on {meta.get('database')}")
+
+    print(f"{'operation':<16}" + "".join(f"{metric:>26}" for metric in METRICS))
+    for name, new_stats in new["results"].items():
+        old_stats = old["results"].get(name)
+        if old_stats is None:
+            continue
+        cells = [
+            f"{old_stats[m]:>8} -> {new_stats[m]:<8} "
+            f"{change(old_stats[m], new_stats[m]):>7}"
+            for m in METRICS
+        ]
+        print(f"{name:<16}" + "".join(f"{cell:>26}" for cell in cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Negotiated gzip/brotli compression for JSON responses."""
+import gzip
+import importlib
+import os
+
+from flask import Response, request
+
+# Imported by name because brotli ships without type information
+try:
+    brotli = importlib.import_module("brotli")
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+# Bodies smaller than this go out as-is; compressing them costs more CPU than
+# it saves on the wire. Levels trade CPU per response for ratio: gzip 1-9,
+# brotli quality 0-11 (levels above ~5 are meant for static assets).
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+COMPRESSIBLE_MIMETYPES = frozenset({"application/json"})
+
+
+def _available_encodings() -> list[str]:
+    # Preferred first: on equal client quality, brotli wins
+    return ["br", "gzip"] if HAS_BROTLI else ["gzip"]
+
+
+def _is_compressible(response: Response) -> bool:
+    return (
+        response.mimetype in COMPRESSIBLE_MIMETYPES
+        and not (response.is_streamed or response.direct_passthrough)
+        and "Content-Encoding" not in response.headers
+    )
+
+
+def compress_response(response: Response) -> Response:
+    """Compress a JSON response with the best encoding the client accepts.
+
+    Streamed, already encoded and small responses pass through untouched.
+    Registered as an ``after_request`` hook.
+    """
+    if (
+        not _is_compressible(response)
+        or (response.content_length or 0) < COMPRESSION_MIN_SIZE
+    ):
+        return response
+
+    # The body now depends on Accept-Encoding, whichever encoding is chosen
+    response.vary.add("Accept-Encoding")
+    encoding = request.accept_encodings.best_match(_available_encodings())
+    if encoding is None:
+        return response
+
+    body = response.get_data()
+    if encoding == "br":
+        compressed = brotli.compress(
+            body, mode=brotli.MODE_TEXT, quality=COMPRESSION_BROTLI_QUALITY
+        )
+    else:
+        compressed = gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    # A strong ETag must change with the encoding; a weak one already allows it
+    etag, weak = response.get_etag()
+    if etag is not None and not weak:
+        response.set_etag(etag, weak=True)
+    return response
@@ -0,0 +1,290 @@
+"""Per-user todo change events, streamed to clients as Server-Sent Events.
+
+Write handlers call ``publish_todo_events`` before committing; the events go
+out only if the transaction commits.
+
+- On PostgreSQL they are sent with ``pg_notify`` inside the transaction, so
+  every worker process sees them. Each process runs one listener thread that
+  ``LISTEN``s on ``TODO_EVENTS_CHANNEL`` and relays them to its streams.
+- Elsewhere (SQLite, tests) they go to the in-process bus after the commit,
+  reaching only streams served by the same process.
+
+Every stream holds a server thread for as long as the client stays
+connected, so each process serves at most ``SSE_MAX_STREAMS`` at once and
+turns further clients away, leaving threads for other requests. The default
+cap only suits a few clients per worker; serving many means a separate
+Gunicorn instance for the events route with many threads (see the README).
+"""
+import logging
+import os
+import queue
+import select
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set
+
+from flask import current_app
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from models import db
+
+logger = logging.getLogger(__name__)
+
+TODO_EVENTS_CHANNEL = "todo_events"
+# PostgreSQL rejects NOTIFY payloads of this many bytes or more
+NOTIFY_PAYLOAD_LIMIT = 8000
+
+# Idle streams get a comment this often, keeping proxies from timing them out
+# and noticing disconnected clients
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+# Events buffered per stream; a client that falls further behind is told to
+# resync instead
+SSE_QUEUE_SIZE = int(os.getenv("SSE_QUEUE_SIZE", "100"))
+# Open streams per process; keep below GUNICORN_THREADS. The default leaves
+# 2 of the default 4 threads for other requests
+SSE_MAX_STREAMS = int(os.getenv("SSE_MAX_STREAMS", "2"))
+LISTEN_RETRY_SECONDS = 5.0
+
+
+class TooManyStreamsError(RuntimeError):
+    """Raised when this process already serves ``SSE_MAX_STREAMS`` streams."""
+
+
+class Subscription:
+    """Queue of encoded events for one stream of one user.
+
+    ``None`` in the queue, or ``stale`` being set, means events were lost and
+    the client has to resync.
+    """
+
+    def __init__(self, user_id: int, maxsize: int) -> None:
+        self.user_id = user_id
+        self.events: "queue.Queue[Optional[str]]" = queue.Queue(maxsize)
+        self.stale = False
+
+    def deliver(self, message: str) -> None:
+        """Queue ``message``, marking the stream stale if it is full."""
+        try:
+            self.events.put_nowait(message)
+        except queue.Full:
+            self.stale = True
+
+    def mark_stale(self) -> None:
+        """Tell the stream that events were lost, waking it if it is idle."""
+        self.stale = True
+        try:
+            self.events.put_nowait(None)
+        except queue.Full:
+            pass
+
+
+class EventBus:
+    """Thread-safe fan-out of encoded events to the user's subscriptions."""
+
+    def __init__(self) -> None:
+        self._subscriptions: Dict[int, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id: int) -> Subscription:
+        """Start receiving the user's events.
+
+        Raises ``TooManyStreamsError`` when ``SSE_MAX_STREAMS`` are open.
+        """
+        subscription = Subscription(user_id, SSE_QUEUE_SIZE)
+        with self._lock:
+            open_streams = sum(len(subs) for subs in self._subscriptions.values())
+            if open_streams >= SSE_MAX_STREAMS:
+                raise TooManyStreamsError("Too many open event streams")
+            self._subscriptions.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop receiving events; unknown subscriptions are ignored."""
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.user_id, None)
+
+    def publish(self, user_id: int, message: str) -> None:
+        """Deliver ``message`` to every subscription of the user."""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(user_id, ()))
+        for subscription in subscriptions:
+            subscription.deliver(message)
+
+    def relay(self, payload: str) -> None:
+        """Deliver a ``"<user id> <kind> <data>"`` payload to the user's streams.
+
+        Raises ``ValueError`` if the payload is not in that form.
+        """
+        if "\n" in payload:
+            raise ValueError(f"Multi-line event payload: {payload!r}")
+        user_id, kind, data = payload.split(" ", 2)
+        self.publish(int(user_id), format_event(kind, data))
+
+    def mark_all_stale(self) -> None:
+        """Tell every stream that events may have been lost."""
+        with self._lock:
+            subscriptions = [s for subs in self._subscriptions.values() for s in subs]
+        for subscription in subscriptions:
+            subscription.mark_stale()
+
+    def subscriber_count(self) -> int:
+        """Number of open subscriptions in this process."""
+        with self._lock:
+            return sum(len(subs) for subs in self._subscriptions.values())
+
+
+event_bus = EventBus()
+
+
+def format_event(kind: str, data: str) -> str:
+    """Encode one Server-Sent Event; ``data`` must be a single line."""
+    return f"event: {kind}\ndata: {data}\n\n"
+
+
+class PostgresListener:
+    """Background thread relaying ``TODO_EVENTS_CHANNEL`` notifications.
+
+    Started on the first subscription in each process (never in a preloading
+    master). After a lost connection it reconnects and marks every stream
+    stale, since notifications sent in between are gone.
+    """
+
+    def __init__(self, bus: EventBus) -> None:
+        self.bus = bus
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self, engine: Engine) -> None:
+        """Start the listener thread unless it is already running."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, args=(engine,), name="todo-events", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self, engine: Engine) -> None:
+        connection_errors = (
+            SQLAlchemyError,
+            OSError,
+            engine.dialect.loaded_dbapi.Error,
+        )
+        while True:
+            try:
+                self._listen(engine)
+            except connection_errors:
+                logger.exception("Todo event listener failed, reconnecting")
+            self.bus.mark_all_stale()
+            time.sleep(LISTEN_RETRY_SECONDS)
+
+    def _listen(self, engine: Engine) -> None:
+        # A dedicated connection: LISTEN needs autocommit and lasts forever
+        pooled = engine.raw_connection()
+        pooled.detach()
+        try:
+            connection: Any = pooled.driver_connection
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {TODO_EVENTS_CHANNEL}")
+            while True:
+                readable, _, _ = select.select([connection], [], [], 60)
+                if not readable:
+                    continue
+                connection.poll()
+                while connection.notifies:
+                    payload = connection.notifies.pop(0).payload
+                    try:
+                        self.bus.relay(payload)
+                    except ValueError:
+                        # Not ours (someone else's NOTIFY); keep listening
+                        logger.warning("Ignored malformed todo event %r", payload)
+        finally:
+            pooled.close()
+
+
+postgres_listener = PostgresListener(event_bus)
+
+
+def _uses_notify() -> bool:
+    return db.engine.dialect.name == "postgresql"
+
+
+def subscribe(user_id: int) -> Subscription:
+    """Subscribe to the user's events, listening for other processes' too."""
+    if _uses_notify():
+        postgres_listener.ensure_started(db.engine)
+    return event_bus.subscribe(user_id)
+
+
+def publish_todo_events(user_id: int, events: Sequence[Dict[str, Any]]) -> None:
+    """Send change events to the user's streams once the session commits.
+
+    Each event is a dict with a ``type`` (``created``, ``updated`` or
+    ``deleted``), the todo ``id`` and, except for deletions, the compact
+    ``todo``. A todo too large for a NOTIFY payload is left out; clients
+    fetch it instead.
+    """
+    payloads: List[str] = []
+    for change in events:
+        payload = f"{user_id} {change['type']} {current_app.json.dumps(change)}"
+        if len(payload.encode()) >= NOTIFY_PAYLOAD_LIMIT:
+            brief = {"type": change["type"], "id": change["id"]}
+            payload = f"{user_id} {change['type']} {current_app.json.dumps(brief)}"
+        payloads.append(payload)
+    if not payloads:
+        return
+
+    if _uses_notify():
+        # Delivered by PostgreSQL at commit, and dropped on rollback
+        db.session.execute(
+            text(
+                "SELECT pg_notify(:channel, payload) "
+                "FROM unnest(CAST(:payloads AS text[])) AS payload"
+            ),
+            {"channel": TODO_EVENTS_CHANNEL, "payloads": payloads},
+        )
+    else:
+        # Held until commit; a transaction is begun so that a rollback, even
+        # with nothing flushed yet, fires the hook that discards them
+        session = db.session()
+        if not session.in_transaction():
+            session.begin()
+        session.info.setdefault("todo_events", []).extend(payloads)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session: Session) -> None:
+    for payload in session.info.pop("todo_events", ()):
+        event_bus.relay(payload)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back(session: Session, _previous_transaction: Any) -> None:
+    session.info.pop("todo_events", None)
+
+
+def event_stream(subscription: Subscription) -> Iterator[str]:
+    """Yield the subscription's events, with heartbeats while idle.
+
+    Ends with a ``resync`` event if events were lost; the client should then
+    catch up with ``GET /api/todos/sync``. The caller unsubscribes once the
+    response is closed, which also covers streams closed before they start.
+    """
+    # Sent at once so the client knows the stream is open
+    yield ": connected\n\n"
+    while not subscription.stale:
+        try:
+            message = subscription.events.get(timeout=SSE_HEARTBEAT_SECONDS)
+        except queue.Empty:
+            yield ": keepalive\n\n"
+            continue
+        if message is None:
+            break
+        yield message
+    yield format_event("resync", "{}")
@@ -0,0 +1,162 @@
+"""Password hashing offloaded to a bounded process pool.
+
+Werkzeug's password KDFs are deliberately slow and hold the GIL, so running
+them inline in a request handler stalls every other thread in the worker.
+``password_hasher`` runs them in separate processes instead.
+
+Each caller still holds its request thread until its hash is done, so the
+number outstanding per process is capped well below ``GUNICORN_THREADS``:
+further callers are turned away at once (a 503 for logins) instead of
+waiting, and a login storm leaves threads free for other endpoints.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from werkzeug.security import (DEFAULT_PBKDF2_ITERATIONS, check_password_hash,
+                               generate_password_hash)
+
+T = TypeVar("T")
+
+# Werkzeug method spec: "scrypt:<n>:<r>:<p>" or "pbkdf2:<hash>:<iterations>".
+# Raising the cost upgrades existing hashes as users log in.
+PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+
+# 0 workers hashes inline in the calling thread (useful for tests and tools)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "1"))
+# Hashes outstanding per process, each holding a request thread. Together
+# with SSE_MAX_STREAMS keep it below GUNICORN_THREADS; the defaults (1 + 2
+# of 4 threads) leave a thread for everything else.
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "1"))
+PASSWORD_HASH_TIMEOUT_SECONDS = float(os.getenv("PASSWORD_HASH_TIMEOUT_SECONDS", "5"))
+
+
+class HashingBusyError(RuntimeError):
+    """Raised when a hash cannot be computed because the pool is saturated."""
+
+
+def canonical_method(method: str) -> str:
+    """Expand a werkzeug method spec with werkzeug's defaults filled in.
+
+    Werkzeug records the fully expanded spec in each hash (``"scrypt"`` is
+    stored as ``"scrypt:32768:8:1"``), so comparisons must use that form.
+    """
+    name, *params = method.split(":")
+    if name == "scrypt":
+        defaults = ["32768", "8", "1"]
+    elif name == "pbkdf2":
+        defaults = ["sha256", str(DEFAULT_PBKDF2_ITERATIONS)]
+    else:
+        raise ValueError(f"Unsupported password hash method: {method}")
+    if len(params) > len(defaults):
+        raise ValueError(f"Unsupported password hash method: {method}")
+    return ":".join([name, *params, *defaults[len(params) :]])
+
+
+class PasswordHasher:
+    """Runs password hashing and verification on a process pool."""
+
+    def __init__(
+        self,
+        workers: int,
+        max_pending: int,
+        timeout: float,
+        method: str = PASSWORD_HASH_METHOD,
+    ) -> None:
+        self.method = canonical_method(method)
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._rejected = 0
+
+    def hash(self, password: str) -> str:
+        """Hash ``password`` for storage using the configured method."""
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, pw_hash: str, password: str) -> bool:
+        """Check ``password`` against a stored hash."""
+        return self._run(check_password_hash, pw_hash, password)
+
+    def needs_rehash(self, pw_hash: str) -> bool:
+        """Whether ``pw_hash`` was made with other than the configured method."""
+        return pw_hash.split("$", 1)[0] != self.method
+
+    def stats(self) -> Dict[str, int]:
+        """Return pool size and queue depth."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "queued": max(self._pending - self.workers, 0),
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes; the pool restarts on next use."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        if self.workers <= 0:
+            return fn(*args)
+
+        with self._lock:
+            # No waiting for a slot: a waiting caller would hold its thread
+            if self._pending >= max(self.max_pending, 1):
+                self._rejected += 1
+                raise HashingBusyError("Password hashing queue is full")
+            self._pending += 1
+            executor = self._get_executor()
+        try:
+            future = executor.submit(fn, *args)
+        except BaseException:
+            self._release_slot()
+            raise
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError as e:
+            # Dropped if it has not started yet
+            future.cancel()
+            raise HashingBusyError("Password hashing timed out") from e
+        finally:
+            # Runs at once if the work is done, else when it finishes: work
+            # still running after a timeout keeps its slot, so the cap counts
+            # what actually occupies the pool
+            future.add_done_callback(self._release_slot)
+
+    def _release_slot(self, _future: Optional["Future[Any]"] = None) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def _get_executor(self) -> Executor:
+        # Called with self._lock held
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def reset_after_fork(self) -> None:
+        """Drop state inherited from the parent; the child starts its own pool."""
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = 0
+
+
+password_hasher = PasswordHasher(
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_HASH_MAX_PENDING,
+    PASSWORD_HASH_TIMEOUT_SECONDS,
+    PASSWORD_HASH_METHOD,
+)
+os.register_at_fork(after_in_child=password_hasher.reset_after_fork)
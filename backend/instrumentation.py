@@ -0,0 +1,178 @@
+"""Opt-in per-request timing: phases, SQL counts, Server-Timing and histograms.
+
+With ``INSTRUMENTATION_ENABLED`` set, every request records its total time and
+the time spent in these phases:
+
+- ``auth``: resolving the bearer token to a user (``get_current_user``)
+- ``validation``: building Pydantic request models
+- ``db``: SQL statements, with the statement count (all engines)
+- ``serialize``: building the response dicts in list handlers, and encoding
+  the JSON response
+
+The phases go out in a ``Server-Timing`` header and feed per-endpoint
+histograms reported by ``/health/metrics``. ``db`` overlaps the other phases
+when they run queries (``auth`` loading the user, for instance). Off by
+default: the header exposes internals and the hooks cost a little per query.
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+from flask import Flask, Response, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+INSTRUMENTATION_ENABLED = os.getenv("INSTRUMENTATION_ENABLED", "false").lower() in (
+    "1",
+    "true",
+)
+
+# Upper bounds of the histogram buckets; each histogram adds a +Inf bucket
+DURATION_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """Thread-safe bucketed counts of observed values, with count and sum."""
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = tuple(bounds)
+        self._counts = [0] * (len(self.bounds) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Count ``value`` in the first bucket whose bound is at least it."""
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return count, sum and cumulative bucket counts keyed by upper bound."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        buckets: Dict[str, int] = {}
+        running = 0
+        for bound, bucket_count in zip((*self.bounds, "+Inf"), counts):
+            running += bucket_count
+            buckets[str(bound)] = running
+        return {"count": running, "sum": round(total, 3), "buckets": buckets}
+
+
+_histograms: Dict[Tuple[str, str], Histogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def _histogram(endpoint: str, metric: str) -> Histogram:
+    key = (endpoint, metric)
+    histogram = _histograms.get(key)
+    if histogram is None:
+        bounds = QUERY_COUNT_BUCKETS if metric == "sql_queries" else DURATION_BUCKETS_MS
+        with _histograms_lock:
+            histogram = _histograms.setdefault(key, Histogram(bounds))
+    return histogram
+
+
+def timing_stats() -> Dict[str, Dict[str, Any]]:
+    """Histograms per endpoint: durations in milliseconds, plus SQL counts."""
+    with _histograms_lock:
+        items = sorted(_histograms.items())
+    stats: Dict[str, Dict[str, Any]] = {}
+    for (endpoint, metric), histogram in items:
+        stats.setdefault(endpoint, {})[metric] = histogram.snapshot()
+    return stats
+
+
+def reset_timing_stats() -> None:
+    """Drop all recorded histograms."""
+    with _histograms_lock:
+        _histograms.clear()
+
+
+def _request_timings() -> Optional[Dict[str, float]]:
+    # Only requests that started while instrumentation was on carry timings
+    if not has_request_context():
+        return None
+    return g.get("timings")
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Add the time spent in the block to phase ``name`` of this request."""
+    timings = _request_timings()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+
+
+def _start_request() -> None:
+    if INSTRUMENTATION_ENABLED:
+        g.timings = {}
+        g.sql_queries = 0
+        g.request_started = time.perf_counter()
+
+
+def _finish_request(response: Response) -> Response:
+    timings = _request_timings()
+    if timings is None:
+        return response
+    total = time.perf_counter() - g.request_started
+    queries = g.sql_queries
+    endpoint = request.endpoint or "<unmatched>"
+
+    metrics = [f"total;dur={total * 1000:.2f}"]
+    for name, seconds in timings.items():
+        entry = f"{name};dur={seconds * 1000:.2f}"
+        if name == "db":
+            entry += f';desc="{queries} queries"'
+        metrics.append(entry)
+    response.headers["Server-Timing"] = ", ".join(metrics)
+
+    _histogram(endpoint, "total").observe(total * 1000)
+    for name, seconds in timings.items():
+        _histogram(endpoint, name).observe(seconds * 1000)
+    _histogram(endpoint, "sql_queries").observe(queries)
+    return response
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn: Any, *_args: Any) -> None:
+    if INSTRUMENTATION_ENABLED and _request_timings() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn: Any, *_args: Any) -> None:
+    started = conn.info.get("query_started")
+    timings = _request_timings()
+    if started and timings is not None:
+        timings["db"] = timings.get("db", 0.0) + time.perf_counter() - started.pop()
+        g.sql_queries += 1
+
+
+@event.listens_for(Engine, "handle_error")
+def _discard_failed_query(context: Any) -> None:
+    # after_cursor_execute never fires for a failed statement
+    if context.connection is not None:
+        started = context.connection.info.get("query_started")
+        if started:
+            started.pop()
+
+
+def init_app(app: Flask) -> None:
+    """Register the request hooks; they do nothing while instrumentation is off.
+
+    Register before other ``after_request`` hooks so the total includes them.
+    """
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
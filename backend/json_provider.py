@@ -0,0 +1,58 @@
+"""JSON provider that encodes with orjson when it is installed."""
+from datetime import date
+from typing import Any
+
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+
+from instrumentation import phase
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Encode with orjson, falling back to the stdlib ``json`` module.
+
+    Both encoders write dates and datetimes in ISO 8601 (Flask's default
+    writes HTTP dates), so models hand datetimes over unformatted. Keys keep
+    insertion order, which handlers already build deterministically.
+    """
+
+    sort_keys = False
+    use_orjson = HAS_ORJSON
+
+    @staticmethod
+    def default(o: Any) -> Any:
+        """Encode values neither encoder handles natively."""
+        if isinstance(o, date):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize ``obj``; stdlib keyword arguments force the stdlib encoder."""
+        if self.use_orjson and not kwargs:
+            return self._orjson_dumps(obj).decode()
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Serialize straight to the response body without a str round trip."""
+        with phase("serialize"):
+            if not self.use_orjson:
+                return super().response(*args, **kwargs)
+            obj = self._prepare_response_obj(args, kwargs)
+            option = 0
+            if (self.compact is None and self._app.debug) or self.compact is False:
+                option = orjson.OPT_INDENT_2
+            return self._app.response_class(
+                self._orjson_dumps(obj, option) + b"\n", mimetype=self.mimetype
+            )
+
+    def _orjson_dumps(self, obj: Any, option: int = 0) -> bytes:
+        return orjson.dumps(
+            obj, default=self.default, option=option | orjson.OPT_NON_STR_KEYS
+        )
@@ -0,0 +1,42 @@
+"""Index todos on (owner_id, updated_at).
+
+Built with CREATE INDEX CONCURRENTLY on PostgreSQL so writes to todos are
+not blocked while it builds. Concurrent builds cannot run inside a
+transaction, hence the autocommit block; if one fails it leaves an invalid
+index behind, which a rerun replaces.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_todos_owner_updated",
+            table_name="todos",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_todos_owner_updated",
+            "todos",
+            ["owner_id", "updated_at"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_todos_owner_updated",
+            table_name="todos",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,38 @@
+"""Add todo_tombstones, recording deletions for delta sync.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Databases built by db.create_all() from later models already have it
+    if not sa.inspect(op.get_bind()).has_table("todo_tombstones"):
+        op.create_table(
+            "todo_tombstones",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("todo_id", sa.Integer(), nullable=False),
+            sa.Column(
+                "owner_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False
+            ),
+            sa.Column("deleted_at", sa.DateTime(), nullable=False),
+        )
+    op.create_index(
+        "ix_todo_tombstones_owner_deleted",
+        "todo_tombstones",
+        ["owner_id", "deleted_at"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_todo_tombstones_owner_deleted", table_name="todo_tombstones")
+    op.drop_table("todo_tombstones")
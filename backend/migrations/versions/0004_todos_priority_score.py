@@ -0,0 +1,41 @@
+"""Store priority_score as a generated column on todos.
+
+Adding a stored generated column rewrites the table on PostgreSQL, holding
+a lock on todos until it finishes. SQLite cannot add one with ALTER TABLE,
+so there the table is copied into a new one instead. Databases that already
+have the column are left alone.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    columns = {column["name"] for column in sa.inspect(bind).get_columns("todos")}
+    if "priority_score" in columns:
+        return
+
+    priority_score = sa.Column(
+        "priority_score",
+        sa.Float(),
+        sa.Computed("importance * 0.6 + urgency * 0.4", persisted=True),
+    )
+    if bind.dialect.name == "sqlite":
+        with op.batch_alter_table("todos", recreate="always") as batch_op:
+            batch_op.add_column(priority_score)
+    else:
+        op.add_column("todos", priority_score)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("todos") as batch_op:
+        batch_op.drop_column("priority_score")
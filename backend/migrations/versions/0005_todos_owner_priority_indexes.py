@@ -0,0 +1,58 @@
+"""Index todos per owner in list order (priority_score, created_at, id).
+
+One index for the plain list, one for lists filtered by status and a
+partial one for the open (pending or in progress) todos. Built
+concurrently like 0002, replacing any left over from a failed build.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+OPEN_STATUSES = "status IN ('pending', 'in_progress')"
+INDEXES = (
+    "ix_todos_owner_priority",
+    "ix_todos_owner_status_priority",
+    "ix_todos_owner_open_priority",
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(
+                name, table_name="todos", if_exists=True, postgresql_concurrently=True
+            )
+        op.create_index(
+            "ix_todos_owner_priority",
+            "todos",
+            ["owner_id", sa.text("priority_score DESC"), "created_at", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_todos_owner_status_priority",
+            "todos",
+            ["owner_id", "status", sa.text("priority_score DESC"), "created_at", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_todos_owner_open_priority",
+            "todos",
+            ["owner_id", sa.text("priority_score DESC"), "created_at", "id"],
+            postgresql_concurrently=True,
+            postgresql_where=sa.text(OPEN_STATUSES),
+            sqlite_where=sa.text(OPEN_STATUSES),
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(name, table_name="todos", postgresql_concurrently=True)
@@ -0,0 +1,39 @@
+"""Add the full-text search_vector column and its GIN index (PostgreSQL only).
+
+The GIN index is built concurrently like 0002, replacing any left over from
+a failed build. Other databases search with LIKE and get nothing here.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute(
+        "ALTER TABLE todos ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('english', "
+        "coalesce(title, '') || ' ' || coalesce(description, ''))) STORED"
+    )
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_todos_search_vector")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY ix_todos_search_vector "
+            "ON todos USING GIN (search_vector)"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_todos_search_vector")
+    op.execute("ALTER TABLE todos DROP COLUMN IF EXISTS search_vector")
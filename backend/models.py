@@ -1,11 +1,15 @@
 """Database models - example template with User and domain models."""
 from datetime import datetime, timezone
-from typing import Any, Dict, List, cast
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Sequence, cast
 
 from flask_sqlalchemy import SQLAlchemy
-from werkzeug.security import check_password_hash, generate_password_hash
+from sqlalchemy import DDL, event
 
-db = SQLAlchemy()
+from hashing import password_hasher
+from replica import RoutingSession
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 
 
 class User(db.Model):  # type: ignore  # db.Model lacks type stubs
@@ -32,27 +36,125 @@ class User(db.Model):  # type: ignore  # db.Model lacks type stubs
         List["Todo"],
         db.relationship("Todo", back_populates="owner", cascade="all, delete-orphan"),
     )
+    tombstones = cast(
+        List["TodoTombstone"],
+        db.relationship("TodoTombstone", cascade="all, delete-orphan"),
+    )
 
     def set_password(self, password: str) -> None:
         """Hash and set user password."""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password: str) -> bool:
         """Check if provided password matches hash."""
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
+
+    def needs_rehash(self) -> bool:
+        """Check if the password hash predates the configured hash method."""
+        return password_hasher.needs_rehash(self.password_hash)
 
     def to_dict(self, include_email: bool = False) -> Dict[str, Any]:
         """Convert user to dictionary."""
         data: Dict[str, Any] = {
             "id": self.id,
             "username": self.username,
-            "created_at": self.created_at.isoformat(),
+            "created_at": self.created_at,
         }
         if include_email:
             data["email"] = self.email
         return data
 
 
+# Importance/urgency level labels and icons, built once and read-only since
+# every serialized todo shares them; unknown levels render as Medium
+LEVEL_NAMES: MappingProxyType[int, str] = MappingProxyType(
+    {1: "Low", 2: "Medium", 3: "High", 4: "Critical"}
+)
+LEVEL_ICONS: MappingProxyType[int, str] = MappingProxyType(
+    {
+        1: (
+            '<svg width="16" height="16" viewBox="0 0 16 16" '
+            'xmlns="http://www.w3.org/2000/svg">'
+            '<circle cx="8" cy="8" r="7" fill="#FFC107"/></svg>'
+        ),  # Low - yellow circle
+        2: (
+            '<svg width="16" height="16" viewBox="0 0 16 16" '
+            'xmlns="http://www.w3.org/2000/svg">'
+            '<path d="M8 2 L14 14 L2 14 Z" fill="#FF7811"/></svg>'
+        ),  # Medium - deep orange triangle
+        3: (
+            '<svg width="16" height="16" viewBox="0 0 16 16" '
+            'xmlns="http://www.w3.org/2000/svg">'
+            '<rect x="2" y="2" width="12" height="12" fill="#F44336"/>'
+            "</svg>"
+        ),  # High - red square
+        4: (
+            '<svg width="16" height="16" viewBox="0 0 16 16" '
+            'xmlns="http://www.w3.org/2000/svg">'
+            '<path d="M8 1 L10 6 L15 7 L11 11 L12 16 L8 13 L4 16 '
+            'L5 11 L1 7 L6 6 Z" fill="#2196F3"/></svg>'
+        ),  # Critical - blue star
+    }
+)
+DEFAULT_LEVEL_NAME = LEVEL_NAMES[2]
+DEFAULT_LEVEL_ICON = LEVEL_ICONS[2]
+
+# Todo columns in the order ``serialize_todo_row`` expects them
+TODO_ROW_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "status",
+    "importance",
+    "urgency",
+    "priority_score",
+    "created_at",
+    "updated_at",
+)
+
+
+def serialize_todo_row(
+    row: Sequence[Any],
+    owner: Optional[Dict[str, Any]] = None,
+    compact: bool = False,
+) -> Dict[str, Any]:
+    """Serialize todo values given in ``TODO_ROW_FIELDS`` order.
+
+    Produces the same dict as ``Todo.to_dict`` without needing a model
+    instance; ``owner`` is the owner's ``to_dict()``, which callers listing
+    one user's todos build once and share.
+    """
+    (
+        todo_id,
+        title,
+        description,
+        status,
+        importance,
+        urgency,
+        priority_score,
+        created_at,
+        updated_at,
+    ) = row
+    data: Dict[str, Any] = {
+        "id": todo_id,
+        "title": title,
+        "description": description,
+        "status": status,
+        "importance": importance,
+        "urgency": urgency,
+        "priority_score": priority_score,
+        "created_at": created_at,
+        "updated_at": updated_at,
+    }
+    if not compact:
+        data["owner"] = owner
+        data["importance_label"] = LEVEL_NAMES.get(importance, DEFAULT_LEVEL_NAME)
+        data["urgency_label"] = LEVEL_NAMES.get(urgency, DEFAULT_LEVEL_NAME)
+        data["importance_icon"] = LEVEL_ICONS.get(importance, DEFAULT_LEVEL_ICON)
+        data["urgency_icon"] = LEVEL_ICONS.get(urgency, DEFAULT_LEVEL_ICON)
+    return data
+
+
 class Todo(db.Model):  # type: ignore  # db.Model lacks type stubs
     """Todo model with importance and urgency prioritization."""
 
@@ -68,6 +170,13 @@ class Todo(db.Model):  # type: ignore  # db.Model lacks type stubs
     importance = db.Column(db.Integer, nullable=False, default=2)
     urgency = db.Column(db.Integer, nullable=False, default=2)
 
+    # Weighted priority score (importance 60%, urgency 40%). Stored as a
+    # generated column so the database keeps it in sync with every write and
+    # the list ordering can be served from an index.
+    priority_score = db.Column(
+        db.Float, db.Computed("importance * 0.6 + urgency * 0.4", persisted=True)
+    )
+
     created_at = db.Column(
         db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc)
     )
@@ -85,69 +194,120 @@ class Todo(db.Model):  # type: ignore  # db.Model lacks type stubs
     __table_args__ = (
         db.CheckConstraint("importance BETWEEN 1 AND 4", name="check_importance"),
         db.CheckConstraint("urgency BETWEEN 1 AND 4", name="check_urgency"),
+        # Matches the list ordering so per-user sorted reads are index scans
+        db.Index(
+            "ix_todos_owner_priority",
+            owner_id,
+            priority_score.desc(),
+            created_at,
+            id,
+        ),
+        # Sorted reads filtered to a single status
+        db.Index(
+            "ix_todos_owner_status_priority",
+            owner_id,
+            status,
+            priority_score.desc(),
+            created_at,
+            id,
+        ),
+        # Sorted reads of open todos only (the default "hide completed" view)
+        db.Index(
+            "ix_todos_owner_open_priority",
+            owner_id,
+            priority_score.desc(),
+            created_at,
+            id,
+            postgresql_where=db.text("status IN ('pending', 'in_progress')"),
+            sqlite_where=db.text("status IN ('pending', 'in_progress')"),
+        ),
+        # Per-user change tracking (latest updated_at for ETags, recent edits)
+        db.Index("ix_todos_owner_updated", owner_id, updated_at),
     )
 
-    def priority_score(self) -> float:
-        """Calculate weighted priority score (importance 60%, urgency 40%)."""
-        return (self.importance * 0.6) + (self.urgency * 0.4)
-
     @staticmethod
     def get_level_name(level: int) -> str:
         """Get name for importance/urgency level."""
-        levels = {1: "Low", 2: "Medium", 3: "High", 4: "Critical"}
-        return levels.get(level, "Medium")
+        return LEVEL_NAMES.get(level, DEFAULT_LEVEL_NAME)
 
     @staticmethod
     def get_level_icon(level: int) -> str:
         """Get SVG icon for importance/urgency level."""
-        icons = {
-            1: (
-                '<svg width="16" height="16" viewBox="0 0 16 16" '
-                'xmlns="http://www.w3.org/2000/svg">'
-                '<circle cx="8" cy="8" r="7" fill="#FFC107"/></svg>'
-            ),  # Low - yellow circle
-            2: (
-                '<svg width="16" height="16" viewBox="0 0 16 16" '
-                'xmlns="http://www.w3.org/2000/svg">'
-                '<path d="M8 2 L14 14 L2 14 Z" fill="#FF7811"/></svg>'
-            ),  # Medium - deep orange triangle
-            3: (
-                '<svg width="16" height="16" viewBox="0 0 16 16" '
-                'xmlns="http://www.w3.org/2000/svg">'
-                '<rect x="2" y="2" width="12" height="12" fill="#F44336"/>'
-                "</svg>"
-            ),  # High - red square
-            4: (
-                '<svg width="16" height="16" viewBox="0 0 16 16" '
-                'xmlns="http://www.w3.org/2000/svg">'
-                '<path d="M8 1 L10 6 L15 7 L11 11 L12 16 L8 13 L4 16 '
-                'L5 11 L1 7 L6 6 Z" fill="#2196F3"/></svg>'
-            ),  # Critical - blue star
-        }
-        return icons.get(
-            level,
-            (
-                '<svg width="16" height="16" viewBox="0 0 16 16" '
-                'xmlns="http://www.w3.org/2000/svg">'
-                '<path d="M8 2 L14 14 L2 14 Z" fill="#FF7811"/></svg>'
-            ),
+        return LEVEL_ICONS.get(level, DEFAULT_LEVEL_ICON)
+
+    @classmethod
+    def level_table(cls) -> List[Dict[str, Any]]:
+        """Get the name and SVG icon of every importance/urgency level."""
+        return [
+            {
+                "level": level,
+                "name": cls.get_level_name(level),
+                "icon": cls.get_level_icon(level),
+            }
+            for level in (1, 2, 3, 4)
+        ]
+
+    def to_dict(self, compact: bool = False) -> Dict[str, Any]:
+        """Convert todo to dictionary.
+
+        The compact form leaves out the owner and the per-level labels and
+        icons, which repeat across every todo in a list. Datetimes are left
+        for the app's JSON provider to encode.
+        """
+        row = (
+            self.id,
+            self.title,
+            self.description,
+            self.status,
+            self.importance,
+            self.urgency,
+            self.priority_score,
+            self.created_at,
+            self.updated_at,
         )
+        if compact:
+            return serialize_todo_row(row, compact=True)
+        return serialize_todo_row(row, self.owner.to_dict() if self.owner else None)
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert todo to dictionary."""
-        return {
-            "id": self.id,
-            "title": self.title,
-            "description": self.description,
-            "owner": self.owner.to_dict() if self.owner else None,
-            "status": self.status,
-            "importance": self.importance,
-            "urgency": self.urgency,
-            "importance_label": self.get_level_name(self.importance),
-            "urgency_label": self.get_level_name(self.urgency),
-            "importance_icon": self.get_level_icon(self.importance),
-            "urgency_icon": self.get_level_icon(self.urgency),
-            "priority_score": self.priority_score(),
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
-        }
+
+class TodoTombstone(db.Model):  # type: ignore  # db.Model lacks type stubs
+    """Record of a deleted todo, so syncing clients learn about the deletion."""
+
+    __tablename__ = "todo_tombstones"
+
+    id = db.Column(db.Integer, primary_key=True)
+    # Not a foreign key: the todo row is gone
+    todo_id = db.Column(db.Integer, nullable=False)
+    owner_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    deleted_at = db.Column(
+        db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
+
+    __table_args__ = (
+        # Per-user deletions since a sync point, and pruning by age
+        db.Index("ix_todo_tombstones_owner_deleted", owner_id, deleted_at),
+    )
+
+
+# Full-text search (PostgreSQL only): a generated tsvector over title and
+# description, kept current by the database on every write, with a GIN index.
+# It is not mapped on the model, so queries refer to it by name; other
+# databases fall back to LIKE matching.
+TODO_SEARCH_CONFIG = "english"
+
+event.listen(
+    Todo.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE todos ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('{TODO_SEARCH_CONFIG}', "
+        "coalesce(title, '') || ' ' || coalesce(description, ''))) STORED"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    Todo.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX ix_todos_search_vector ON todos USING GIN (search_vector)"
+    ).execute_if(dialect="postgresql"),
+)
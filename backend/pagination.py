@@ -0,0 +1,50 @@
+"""Opaque keyset (cursor) pagination helpers."""
+import base64
+import binascii
+from typing import Any, Sequence, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import and_, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+M = TypeVar("M", bound=BaseModel)
+
+# (sort expression, descending?) pairs, most significant first
+SortKeys = Sequence[Tuple[ColumnElement[Any], bool]]
+
+
+def encode_cursor(position: BaseModel) -> str:
+    """Encode the sort-key values of the last row on a page as a cursor."""
+    raw = position.model_dump_json().encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, schema: Type[M]) -> M:
+    """Decode a cursor produced by ``encode_cursor``.
+
+    Raises ``ValueError`` if the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        return schema.model_validate_json(raw)
+    except (binascii.Error, ValidationError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def keyset_after(sort_keys: SortKeys, values: Sequence[Any]) -> ColumnElement[bool]:
+    """Build a WHERE clause selecting rows strictly after ``values``.
+
+    Expands to ``k1 > v1 OR (k1 = v1 AND (k2 > v2 OR (k2 = v2 AND ...)))``
+    with the comparison flipped for descending keys, so the database can
+    seek straight to the next page instead of skipping rows with OFFSET.
+    """
+    condition = None
+    for (column, descending), value in reversed(list(zip(sort_keys, values))):
+        after = column < value if descending else column > value
+        if condition is None:
+            condition = after
+        else:
+            condition = or_(after, and_(column == value, condition))
+    if condition is None:
+        raise ValueError("At least one sort key is required")
+    return condition
@@ -0,0 +1,160 @@
+"""Read-replica routing for read-only request handlers.
+
+When ``DATABASE_REPLICA_URL`` is set, handlers decorated with
+``replica_reads`` send their queries to the replica engine (bind key
+``"replica"``) instead of the primary. Everything else, including any
+flush or DML statement, always uses the primary.
+
+Replicas lag behind the primary, so a user who wrote recently keeps reading
+from the primary for ``REPLICA_READ_YOUR_WRITES_SECONDS``. The process that
+handled the write remembers the user, and every other worker learns of it
+from a signed marker: responses to writes carry it in ``LAST_WRITE_HEADER``
+and clients send it back on later requests. Handlers can also fall back to
+the primary explicitly with ``use_primary`` when a row is missing on the
+replica.
+"""
+import math
+import os
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Iterator, Optional, TypeVar, Union, cast
+
+from flask import Response, current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from itsdangerous import BadSignature, TimestampSigner
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import ORMExecuteState
+
+from cache import TTLCache
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+REPLICA_BIND_KEY = "replica"
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+REPLICA_READ_YOUR_WRITES_SECONDS = float(
+    os.getenv("REPLICA_READ_YOUR_WRITES_SECONDS", "5")
+)
+
+# Response header carrying the last-write marker, echoed back by clients
+LAST_WRITE_HEADER = "X-Last-Write"
+
+# User ids that committed a write recently in this process; they are pinned
+# to the primary
+recent_writers: TTLCache[int, bool] = TTLCache(
+    100_000, REPLICA_READ_YOUR_WRITES_SECONDS
+)
+
+
+def replica_reads(f: F) -> F:
+    """Decorator allowing a read-only handler to query the replica."""
+
+    @wraps(f)
+    def decorated_function(*args: Any, **kwargs: Any) -> Any:
+        g.replica_reads = True
+        return f(*args, **kwargs)
+
+    return cast(F, decorated_function)
+
+
+@contextmanager
+def use_primary() -> Iterator[None]:
+    """Send the queries in this block to the primary regardless of routing."""
+    previous = g.get("replica_reads", False)
+    g.replica_reads = False
+    try:
+        yield
+    finally:
+        g.replica_reads = previous
+
+
+def reading_from_replica() -> bool:
+    """Whether queries issued now would be routed to the replica."""
+    if not has_request_context() or not g.get("replica_reads", False):
+        return False
+    user_id = g.get("current_user_id")
+    if user_id is None:
+        return True
+    return recent_writers.get(user_id) is None and not _sent_last_write(user_id)
+
+
+def _last_write_signer() -> TimestampSigner:
+    return TimestampSigner(current_app.secret_key or "", salt="replica-last-write")
+
+
+def _sent_last_write(user_id: int) -> bool:
+    """Whether the request carries a fresh last-write marker for the user."""
+    marker = request.headers.get(LAST_WRITE_HEADER)
+    if marker is None:
+        return False
+    try:
+        signed_user_id = _last_write_signer().unsign(
+            marker, max_age=math.ceil(REPLICA_READ_YOUR_WRITES_SECONDS)
+        )
+    except BadSignature:
+        return False
+    return signed_user_id == str(user_id).encode()
+
+
+def add_last_write_header(response: Response) -> Response:
+    """``after_request`` hook handing a writer its last-write marker."""
+    user_id = g.pop("wrote_as_user_id", None)
+    if user_id is not None:
+        marker = _last_write_signer().sign(str(user_id)).decode()
+        response.headers[LAST_WRITE_HEADER] = marker
+    return response
+
+
+class RoutingSession(Session):
+    """Session that routes reads to the replica inside ``replica_reads`` handlers."""
+
+    def get_bind(
+        self,
+        mapper: Optional[Any] = None,
+        clause: Optional[Any] = None,
+        bind: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> Union[Engine, Connection]:
+        engines = self._db.engines
+        if (
+            bind is None
+            and REPLICA_BIND_KEY in engines
+            and self._is_read_only(clause)
+            and reading_from_replica()
+        ):
+            return engines[REPLICA_BIND_KEY]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _is_read_only(self, clause: Optional[Any]) -> bool:
+        """Whether executing ``clause`` now can neither write nor miss a write."""
+        return (
+            not self._flushing
+            and not (self.new or self.dirty or self.deleted)
+            and not getattr(clause, "is_dml", False)
+        )
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _note_flush(session: RoutingSession, _flush_context: Any) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _note_dml(orm_execute_state: ORMExecuteState) -> None:
+    state = orm_execute_state
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _pin_writer_to_primary(session: RoutingSession) -> None:
+    if session.info.pop("wrote", False) and has_request_context():
+        user_id = g.get("current_user_id")
+        if user_id is not None:
+            recent_writers.set(user_id, True)
+            g.wrote_as_user_id = user_id
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _forget_writes(session: RoutingSession) -> None:
+    session.info.pop("wrote", None)
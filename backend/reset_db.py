@@ -1,4 +1,6 @@
-"""Reset database - drops all tables and recreates them."""
+"""Reset database - drops all tables and recreates them from the migrations."""
+from alembic import command
+from alembic.config import Config
 from sqlalchemy import inspect, text
 
 from api import app
@@ -18,6 +20,6 @@ if __name__ == "__main__":
             db.session.commit()
             print(f"  Dropped {len(tables)} tables")
 
-        print("Creating all tables...")
-        db.create_all()
+        print("Applying migrations...")
+        command.upgrade(Config("alembic.ini"), "head")
         print("✓ Database schema recreated successfully!")
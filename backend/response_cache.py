@@ -0,0 +1,191 @@
+"""Cache of rendered todo list responses, per process or shared via Redis.
+
+Entries are grouped per user and keyed by the list's ETag, which changes
+with the user's todo set (see ``_todo_set_version`` in api.py) and the query
+string. A write changes the key of every list it affects, even in workers
+that never heard of it, so no worker serves a list from before a write;
+write handlers also drop the user's entries so they stop taking up room.
+
+``TODO_LIST_CACHE_URL`` picks the backend: unset keeps an LRU in each
+process, a ``redis://`` URL shares entries between workers through any
+Redis-compatible server (needs the ``redis`` package). A TTL of zero turns
+the cache off.
+"""
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Protocol
+
+from cache import TTLCache
+
+try:
+    import redis
+
+    HAS_REDIS = True
+except ImportError:
+    HAS_REDIS = False
+
+logger = logging.getLogger(__name__)
+
+TODO_LIST_CACHE_URL = os.getenv("TODO_LIST_CACHE_URL")
+TODO_LIST_CACHE_TTL_SECONDS = int(os.getenv("TODO_LIST_CACHE_TTL_SECONDS", "300"))
+# In-process backend only: users kept, and cached lists (filters, pages,
+# views) per user
+TODO_LIST_CACHE_MAX_USERS = int(os.getenv("TODO_LIST_CACHE_MAX_USERS", "1000"))
+TODO_LIST_CACHE_VARIANTS = int(os.getenv("TODO_LIST_CACHE_VARIANTS", "8"))
+
+
+class ResponseCache(Protocol):
+    """Rendered response bodies, keyed by user and a per-user key."""
+
+    def get(self, user_id: int, key: str) -> Optional[bytes]:
+        """Return the cached body, or None."""
+
+    def set(self, user_id: int, key: str, body: bytes) -> None:
+        """Store a body."""
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop every body cached for the user."""
+
+    def clear(self) -> None:
+        """Drop every cached body."""
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for monitoring."""
+
+
+class LocalResponseCache:
+    """Per-process LRU of users, each holding their most recent bodies."""
+
+    def __init__(self, max_users: int, ttl: float, variants: int) -> None:
+        self._users: TTLCache[int, Dict[str, bytes]] = TTLCache(max_users, ttl)
+        self.variants = variants
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int, key: str) -> Optional[bytes]:
+        """Return the cached body, or None."""
+        entries = self._users.get(user_id)
+        body = None if entries is None else entries.get(key)
+        with self._lock:
+            if body is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return body
+
+    def set(self, user_id: int, key: str, body: bytes) -> None:
+        """Store a body, dropping the user's oldest one beyond ``variants``."""
+        # Copied, not mutated: readers may hold the previous dict
+        entries = dict(self._users.get(user_id) or {})
+        entries.pop(key, None)
+        entries[key] = body
+        while len(entries) > self.variants:
+            del entries[next(iter(entries))]
+        self._users.set(user_id, entries)
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop every body cached for the user."""
+        self._users.delete(user_id)
+
+    def clear(self) -> None:
+        """Drop everything and reset the counters."""
+        self._users.clear()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss counters."""
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        return {
+            "backend": "local",
+            "users": len(self._users),
+            "hits": hits,
+            "misses": misses,
+        }
+
+
+class RedisResponseCache:
+    """Bodies in one Redis hash per user, shared by every worker.
+
+    Redis errors count as misses, so an unavailable server slows requests
+    down instead of failing them.
+    """
+
+    def __init__(self, client: Any, ttl: int, prefix: str = "todo-list:") -> None:
+        self._client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counts = {"hits": 0, "misses": 0, "errors": 0}
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            self._counts[outcome] += 1
+
+    def get(self, user_id: int, key: str) -> Optional[bytes]:
+        """Return the cached body, or None."""
+        try:
+            body: Optional[bytes] = self._client.hget(f"{self.prefix}{user_id}", key)
+        except redis.RedisError:
+            logger.warning("Todo list cache read failed", exc_info=True)
+            self._count("errors")
+            return None
+        self._count("misses" if body is None else "hits")
+        return body
+
+    def set(self, user_id: int, key: str, body: bytes) -> None:
+        """Store a body; the user's hash expires ``ttl`` after the last write."""
+        if self.ttl <= 0:
+            return
+        name = f"{self.prefix}{user_id}"
+        try:
+            pipeline = self._client.pipeline(transaction=False)
+            pipeline.hset(name, key, body)
+            pipeline.expire(name, self.ttl)
+            pipeline.execute()
+        except redis.RedisError:
+            logger.warning("Todo list cache write failed", exc_info=True)
+            self._count("errors")
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop every body cached for the user."""
+        try:
+            self._client.delete(f"{self.prefix}{user_id}")
+        except redis.RedisError:
+            # The entries are keyed by version, so they cannot be served stale
+            logger.warning("Todo list cache invalidation failed", exc_info=True)
+            self._count("errors")
+
+    def clear(self) -> None:
+        """Drop every cached body and reset the counters."""
+        for name in self._client.scan_iter(match=f"{self.prefix}*"):
+            self._client.delete(name)
+        with self._lock:
+            self._counts = dict.fromkeys(self._counts, 0)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss/error counters."""
+        with self._lock:
+            return {"backend": "redis", **self._counts}
+
+
+def create_response_cache(url: Optional[str]) -> ResponseCache:
+    """Build the backend configured by ``url`` (see the module docstring)."""
+    if not url:
+        return LocalResponseCache(
+            TODO_LIST_CACHE_MAX_USERS,
+            TODO_LIST_CACHE_TTL_SECONDS,
+            TODO_LIST_CACHE_VARIANTS,
+        )
+    if not HAS_REDIS:
+        raise RuntimeError("TODO_LIST_CACHE_URL needs the redis package installed")
+    # Short timeouts: a slow cache must not be slower than rendering the list
+    client = redis.Redis.from_url(url, socket_timeout=0.25, socket_connect_timeout=0.25)
+    return RedisResponseCache(client, TODO_LIST_CACHE_TTL_SECONDS)
+
+
+todo_list_cache = create_response_cache(TODO_LIST_CACHE_URL)
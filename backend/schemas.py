@@ -1,5 +1,6 @@
 """Pydantic schemas for request/response validation."""
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Annotated, Any, Dict, List, Optional, overload
 
 from pydantic import BaseModel, EmailStr, Field, field_validator
 
@@ -47,3 +48,160 @@ class TodoUpdateRequest(BaseModel):
     importance: Optional[int] = Field(None, ge=1, le=4)
     urgency: Optional[int] = Field(None, ge=1, le=4)
     status: Optional[str] = Field(None, pattern="^(pending|in_progress|completed)$")
+
+
+@overload
+def to_naive_utc(v: datetime) -> datetime:
+    ...
+
+
+@overload
+def to_naive_utc(v: None) -> None:
+    ...
+
+
+def to_naive_utc(v: Optional[datetime]) -> Optional[datetime]:
+    """Convert to the naive UTC form timestamps are stored in."""
+    if v is not None and v.tzinfo is not None:
+        return v.astimezone(timezone.utc).replace(tzinfo=None)
+    return v
+
+
+class TodoViewQuery(BaseModel):
+    """Schema for the todo representation query parameter.
+
+    ``compact`` drops the owner, level labels and SVG icons from each todo;
+    clients resolve labels and icons from ``GET /api/todos/levels`` instead.
+    """
+
+    view: str = Field(default="full", pattern="^(full|compact)$")
+
+    @property
+    def compact(self) -> bool:
+        """Whether the compact representation was requested."""
+        return self.view == "compact"
+
+
+class TodoFilterQuery(TodoViewQuery):
+    """Schema for todo filter query parameters.
+
+    ``status`` takes one status or a comma-separated list. Importance and
+    urgency bounds are inclusive; time bounds are exclusive and default to
+    UTC when no offset is given.
+    """
+
+    status: Annotated[
+        Optional[str],
+        Field(
+            pattern="^(pending|in_progress|completed)"
+            "(,(pending|in_progress|completed))*$"
+        ),
+    ] = None
+    min_importance: Optional[int] = Field(None, ge=1, le=4)
+    max_importance: Optional[int] = Field(None, ge=1, le=4)
+    min_urgency: Optional[int] = Field(None, ge=1, le=4)
+    max_urgency: Optional[int] = Field(None, ge=1, le=4)
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    updated_after: Optional[datetime] = None
+    updated_before: Optional[datetime] = None
+
+    @field_validator(
+        "created_after", "created_before", "updated_after", "updated_before"
+    )
+    @classmethod
+    def naive_utc(cls, v: Optional[datetime]) -> Optional[datetime]:
+        """Convert to the naive UTC form timestamps are stored in."""
+        return to_naive_utc(v)
+
+    @property
+    def statuses(self) -> List[str]:
+        """The requested statuses, or an empty list for any status."""
+        return self.status.split(",") if self.status else []
+
+
+class TodoListQuery(TodoFilterQuery):
+    """Schema for todo list query parameters."""
+
+    limit: Optional[int] = Field(None, ge=1, le=500)
+    cursor: Optional[str] = None
+
+
+class TodoExportQuery(TodoFilterQuery):
+    """Schema for todo export query parameters.
+
+    ``json`` streams one ``{"todos": [...]}`` document; ``ndjson`` streams
+    one todo object per line.
+    """
+
+    format: str = Field(default="json", pattern="^(json|ndjson)$")
+
+
+class TodoCursor(BaseModel):
+    """Position of the last todo on a page, in list sort order."""
+
+    priority_score: float
+    created_at: datetime
+    id: int
+
+    @field_validator("created_at")
+    @classmethod
+    def naive_utc(cls, v: datetime) -> datetime:
+        """Convert to the naive UTC form timestamps are stored in."""
+        return to_naive_utc(v)
+
+
+class TodoSyncQuery(TodoViewQuery):
+    """Schema for todo sync query parameters.
+
+    Pass ``sync_token`` from the previous sync or ``since`` (UTC when no
+    offset is given) to start from a known time, not both; with neither,
+    every todo is returned.
+    """
+
+    sync_token: Optional[str] = None
+    since: Optional[datetime] = None
+
+    @field_validator("since")
+    @classmethod
+    def naive_utc(cls, v: Optional[datetime]) -> Optional[datetime]:
+        """Convert to the naive UTC form timestamps are stored in."""
+        return to_naive_utc(v)
+
+
+class TodoSyncToken(BaseModel):
+    """Sync point handed to the client: changes up to here have been sent."""
+
+    since: datetime
+
+    @field_validator("since")
+    @classmethod
+    def naive_utc(cls, v: datetime) -> datetime:
+        """Convert to the naive UTC form timestamps are stored in."""
+        return to_naive_utc(v)
+
+
+class TodoBatchOperation(BaseModel):
+    """Schema for one operation in a todo batch.
+
+    ``data`` is validated separately with ``TodoCreateRequest`` or
+    ``TodoUpdateRequest`` so each item can report its own errors.
+    """
+
+    op: str = Field(pattern="^(create|update|delete)$")
+    id: Optional[int] = None
+    data: Dict[str, Any] = Field(default_factory=dict)
+
+
+class TodoBatchRequest(BaseModel):
+    """Schema for applying several todo operations at once."""
+
+    operations: Annotated[List[TodoBatchOperation], Field(min_length=1, max_length=500)]
+
+
+class TodoSearchQuery(TodoViewQuery):
+    """Schema for todo search query parameters."""
+
+    q: str = Field(min_length=1, max_length=200)
+    limit: int = Field(default=20, ge=1, le=100)
+    page: int = Field(default=1, ge=1, le=1000)
@@ -9,6 +9,7 @@ from flask.testing import FlaskClient
 # Set test environment before importing app
 os.environ["DATABASE_URL"] = "sqlite:///:memory:"
 os.environ["SECRET_KEY"] = "test-secret-key"
+os.environ["PASSWORD_HASH_WORKERS"] = "0"  # hash inline; pool has its own tests
 
 from api import \
     app as \
@@ -23,6 +24,14 @@ def app() -> Generator[Flask, None, None]:
     flask_app.config["TESTING"] = True
     flask_app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
 
+    from auth import token_cache, user_cache
+    from response_cache import todo_list_cache
+
+    # Ids restart with every fresh database, so drop users cached by earlier tests
+    user_cache.clear()
+    token_cache.clear()
+    todo_list_cache.clear()
+
     with flask_app.app_context():
         db.create_all()
         yield flask_app
@@ -67,3 +76,19 @@ def db_session(app: Flask):
     """Provide db session for tests."""
     with app.app_context():
         yield db.session
+
+
+class FakeClock:
+    """Manually advanced clock for expiry tests."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Provide a clock that only moves when a test sets ``now``."""
+    return FakeClock()
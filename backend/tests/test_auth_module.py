@@ -1,13 +1,18 @@
 """Tests for auth module (token generation, validation, decorators)."""
 from datetime import datetime, timedelta, timezone
-from typing import Any, Tuple
+from typing import Any, Dict, Tuple
 
 import jwt
+import pytest
 from flask import Flask, jsonify
 from flask.testing import FlaskClient
+from sqlalchemy import event
 
-from auth import decode_token, generate_token, validate_request_json
-from models import User
+from auth import (decode_token, generate_token, load_user, token_cache,
+                  user_cache, validate_request_json)
+from cache import TTLCache
+from models import User, db
+from tests.conftest import FakeClock
 
 
 def test_generate_token(app: Flask) -> None:
@@ -53,6 +58,48 @@ def test_decode_token_valid(app: Flask) -> None:
     assert payload["user_id"] == user_id
 
 
+def test_decode_token_cached() -> None:
+    """Test repeat decodes of the same token are served from the cache."""
+    token = generate_token(42)
+    hits = token_cache.hits
+
+    first = decode_token(token)
+    second = decode_token(token)
+
+    assert first == second
+    assert second is not None and second["user_id"] == 42
+    assert token_cache.hits == hits + 1
+    # Callers get their own copy of the cached payload
+    second["user_id"] = 7
+    third = decode_token(token)
+    assert third is not None and third["user_id"] == 42
+
+
+def test_decode_token_cache_respects_expiry(
+    monkeypatch: pytest.MonkeyPatch, clock: FakeClock
+) -> None:
+    """Test cached payloads never outlive the token's expiry."""
+    import os
+
+    import auth
+
+    cache: TTLCache[str, Dict[str, Any]] = TTLCache(maxsize=10, ttl=300, clock=clock)
+    monkeypatch.setattr(auth, "token_cache", cache)
+
+    secret = os.getenv("SECRET_KEY", "dev-secret-key")
+    now = datetime.now(timezone.utc)
+    token = jwt.encode(
+        {"user_id": 1, "exp": now + timedelta(seconds=2), "iat": now},
+        secret,
+        algorithm="HS256",
+    )
+
+    assert decode_token(token) is not None
+    assert cache.get(token) is not None
+    clock.now = 2.0
+    assert cache.get(token) is None
+
+
 def test_decode_token_expired() -> None:
     """Test decoding expired token."""
     import os
@@ -154,3 +201,44 @@ def test_validate_request_json_decorator(app: Flask) -> None:
         "/test-validate", headers={"Content-Type": "application/json"}, data=""
     )
     assert response.status_code == 400
+
+
+def test_load_user_cached(app: Flask, sample_user: User) -> None:
+    """Test repeat user lookups are served without querying the database."""
+    user_id = sample_user.id
+    statements: list[str] = []
+
+    def record(*args: Any) -> None:
+        statements.append(args[2])
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        # Each lookup runs in a fresh session, like separate requests
+        db.session.remove()
+        user = load_user(user_id)
+        assert user is not None and user.username == "testuser"
+        db.session.remove()
+        user = load_user(user_id)
+        assert user is not None and user.username == "testuser"
+        assert user in db.session
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+    assert len(statements) == 1
+
+
+def test_load_user_cache_invalidated_on_update(app: Flask, sample_user: User) -> None:
+    """Test changing a user row evicts it from the cache."""
+    user_id = sample_user.id
+    load_user(user_id)
+    assert user_cache.get(user_id) is not None
+
+    user = db.session.get(User, user_id)
+    assert user is not None
+    user.username = "renamed"
+    db.session.commit()
+    assert user_cache.get(user_id) is None
+
+    db.session.remove()
+    user = load_user(user_id)
+    assert user is not None and user.username == "renamed"
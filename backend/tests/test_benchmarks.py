@@ -0,0 +1,21 @@
+"""Smoke test for the API benchmark harness."""
+from flask import Flask
+
+from benchmarks.bench_api import OPERATIONS, run_benchmark, seed
+from models import Todo, User
+
+
+def test_bench_api_runs_every_operation(app: Flask) -> None:
+    """Test seeding and a tiny run complete without errors or leftovers."""
+    users = seed(app, users=2, todos=3)
+    assert [len(user.todo_ids) for user in users] == [3, 3]
+
+    results = run_benchmark(app, users, requests=4, warmup=1)
+
+    assert list(results) == list(OPERATIONS)
+    for stats in results.values():
+        assert stats["requests"] == 4
+        assert stats["errors"] == 0
+        assert 0 < stats["p50_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+    assert User.query.count() == 2
+    assert Todo.query.count() == 6
@@ -0,0 +1,80 @@
+"""Tests for in-process caching utilities."""
+from cache import TTLCache
+from tests.conftest import FakeClock
+
+
+def test_ttl_cache_get_set() -> None:
+    """Test stored values are returned until deleted."""
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60)
+    assert cache.get("a") is None
+
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert len(cache) == 1
+
+    cache.delete("a")
+    assert cache.get("a") is None
+
+
+def test_ttl_cache_expiry(clock: FakeClock) -> None:
+    """Test entries expire after the TTL."""
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=5, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 4.9
+    assert cache.get("a") == 1
+    clock.now = 5.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_per_entry_ttl(clock: FakeClock) -> None:
+    """Test a per-entry TTL shortens, but never extends, an entry's life."""
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=5, clock=clock)
+    cache.set("short", 1, ttl=1)
+    cache.set("long", 2, ttl=100)
+    cache.set("expired", 3, ttl=-1)
+
+    assert cache.get("expired") is None
+    clock.now = 1.0
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+    clock.now = 5.0
+    assert cache.get("long") is None
+
+
+def test_ttl_cache_stats() -> None:
+    """Test hits and misses are counted."""
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+
+    assert cache.stats() == {"size": 1, "maxsize": 10, "hits": 2, "misses": 1}
+    cache.clear()
+    assert cache.stats()["hits"] == 0
+
+
+def test_ttl_cache_evicts_least_recently_used() -> None:
+    """Test the least recently used entry is evicted when full."""
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_disabled() -> None:
+    """Test a zero-sized cache never stores anything."""
+    cache: TTLCache[str, int] = TTLCache(maxsize=0, ttl=60)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+    cache = TTLCache(maxsize=10, ttl=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
@@ -0,0 +1,91 @@
+"""Tests for response compression."""
+import gzip
+import json
+
+import pytest
+
+from compression import brotli
+
+
+@pytest.fixture
+def todo_list_size(client, auth_headers) -> int:
+    """Create enough todos for the list to pass the size threshold."""
+    for i in range(5):
+        client.post("/api/todos", headers=auth_headers, json={"title": f"Todo {i}"})
+    response = client.get("/api/todos", headers=auth_headers)
+    assert "Content-Encoding" not in response.headers
+    return len(response.get_data())
+
+
+@pytest.mark.parametrize(
+    "accept, encoding",
+    [
+        ("gzip", "gzip"),
+        ("gzip, deflate, br", "br"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("*", "br"),
+    ],
+)
+def test_json_response_compressed(
+    client, auth_headers, todo_list_size, accept, encoding
+):
+    """Test the best accepted encoding is applied and advertised."""
+    response = client.get(
+        "/api/todos", headers={**auth_headers, "Accept-Encoding": accept}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == encoding
+    assert "Accept-Encoding" in response.vary
+    body = response.get_data()
+    assert response.content_length == len(body) < todo_list_size
+    decompress = brotli.decompress if encoding == "br" else gzip.decompress
+    assert len(json.loads(decompress(body))["todos"]) == 5
+
+
+def test_identity_when_not_accepted(client, auth_headers, todo_list_size):
+    """Test clients that do not accept an encoding get the plain body."""
+    response = client.get(
+        "/api/todos", headers={**auth_headers, "Accept-Encoding": "identity"}
+    )
+
+    assert "Content-Encoding" not in response.headers
+    assert "Accept-Encoding" in response.vary
+    assert len(response.get_json()["todos"]) == 5
+
+
+def test_gzip_without_brotli(client, auth_headers, todo_list_size, monkeypatch):
+    """Test gzip is used when brotli is not installed."""
+    monkeypatch.setattr("compression.HAS_BROTLI", False)
+    response = client.get(
+        "/api/todos", headers={**auth_headers, "Accept-Encoding": "br, gzip"}
+    )
+
+    assert response.headers["Content-Encoding"] == "gzip"
+
+
+def test_small_response_not_compressed(client, auth_headers, monkeypatch):
+    """Test bodies under COMPRESSION_MIN_SIZE go out unchanged."""
+    headers = {**auth_headers, "Accept-Encoding": "gzip"}
+    response = client.get("/api/todos", headers=headers)
+    assert "Content-Encoding" not in response.headers
+    assert "Accept-Encoding" not in response.vary
+
+    monkeypatch.setattr("compression.COMPRESSION_MIN_SIZE", 0)
+    response = client.get("/api/todos", headers=headers)
+    assert response.headers["Content-Encoding"] == "gzip"
+
+
+def test_streamed_and_not_modified_responses_not_compressed(
+    client, auth_headers, todo_list_size
+):
+    """Test streamed exports and 304 responses pass through."""
+    headers = {**auth_headers, "Accept-Encoding": "gzip"}
+    response = client.get("/api/todos/export", headers=headers)
+    assert "Content-Encoding" not in response.headers
+    assert len(response.get_json()["todos"]) == 5
+
+    etag = client.get("/api/todos", headers=headers).headers["ETag"]
+    response = client.get("/api/todos", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert "Content-Encoding" not in response.headers
@@ -0,0 +1,240 @@
+"""Tests for todo change events and the Server-Sent Events stream."""
+import contextlib
+import json
+import socket
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, cast
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+from sqlalchemy.engine import Engine
+
+from events import EventBus, PostgresListener, event_bus, publish_todo_events
+from models import User, db
+
+
+def _events(chunks: Iterator[bytes], count: int) -> List[Dict]:
+    """Read ``count`` events from a stream, skipping comments."""
+    events: List[Dict] = []
+    while len(events) < count:
+        chunk = next(chunks).decode()
+        if chunk.startswith(":"):
+            continue
+        kind, data = chunk.rstrip("\n").split("\n")
+        events.append({"event": kind.removeprefix("event: "), **json.loads(data[6:])})
+    return events
+
+
+@pytest.fixture
+def stream(client: FlaskClient, auth_headers: dict) -> Iterator[Iterator[bytes]]:
+    """An open event stream for the sample user, connected and subscribed."""
+    response = client.get("/api/todos/events", headers=auth_headers, buffered=False)
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    chunks = cast(Iterator[bytes], iter(response.response))
+    assert next(chunks) == b": connected\n\n"
+    yield chunks
+    response.close()
+
+
+def test_stream_receives_changes(
+    client: FlaskClient, auth_headers: dict, stream: Iterator[bytes]
+) -> None:
+    """Test create, update and delete each push an event."""
+    created = client.post("/api/todos", headers=auth_headers, json={"title": "New"})
+    todo_id = created.get_json()["todo"]["id"]
+    client.patch(
+        f"/api/todos/{todo_id}", headers=auth_headers, json={"status": "completed"}
+    )
+    client.delete(f"/api/todos/{todo_id}", headers=auth_headers)
+
+    created_event, updated_event, deleted_event = _events(stream, 3)
+    assert created_event["event"] == "created"
+    assert created_event["todo"]["title"] == "New"
+    assert "owner" not in created_event["todo"]
+    assert updated_event["event"] == "updated"
+    assert updated_event["todo"]["status"] == "completed"
+    assert deleted_event == {"event": "deleted", "type": "deleted", "id": todo_id}
+
+
+def test_stream_receives_batch_changes(
+    client: FlaskClient, auth_headers: dict, stream: Iterator[bytes]
+) -> None:
+    """Test a batch pushes one event per changed todo."""
+    todo_id = client.post(
+        "/api/todos", headers=auth_headers, json={"title": "Old"}
+    ).get_json()["todo"]["id"]
+    _events(stream, 1)
+
+    client.post(
+        "/api/todos/batch",
+        headers=auth_headers,
+        json={
+            "operations": [
+                {"op": "create", "data": {"title": "Batch"}},
+                {"op": "delete", "id": todo_id},
+            ]
+        },
+    )
+
+    events = _events(stream, 2)
+    assert [event["event"] for event in events] == ["created", "deleted"]
+
+
+def test_stream_only_own_changes(
+    app: Flask, client: FlaskClient, auth_headers: dict, stream: Iterator[bytes]
+) -> None:
+    """Test other users' changes are not pushed."""
+    with app.app_context():
+        other = User(email="other@example.com", username="otheruser")
+        other.set_password("password123")
+        db.session.add(other)
+        db.session.commit()
+        publish_todo_events(other.id, [{"type": "deleted", "id": 1}])
+        db.session.commit()
+    client.post("/api/todos", headers=auth_headers, json={"title": "Mine"})
+
+    [event] = _events(stream, 1)
+    assert event["todo"]["title"] == "Mine"
+
+
+def test_rolled_back_changes_are_not_pushed(
+    app: Flask, client: FlaskClient, sample_user: User, stream: Iterator[bytes]
+) -> None:
+    """Test events are only sent when the transaction commits."""
+    with app.app_context():
+        publish_todo_events(sample_user.id, [{"type": "deleted", "id": 1}])
+        db.session.rollback()
+        publish_todo_events(sample_user.id, [{"type": "deleted", "id": 2}])
+        db.session.commit()
+
+    [event] = _events(stream, 1)
+    assert event["id"] == 2
+
+
+def test_stream_accepts_query_token(client: FlaskClient, auth_headers: dict) -> None:
+    """Test the token may come from the query string for EventSource clients."""
+    token = auth_headers["Authorization"].split(" ")[1]
+    response = client.get(f"/api/todos/events?access_token={token}", buffered=False)
+    assert response.status_code == 200
+    response.close()
+    assert event_bus.subscriber_count() == 0
+
+
+def test_unstarted_streams_release_their_slot(
+    client: FlaskClient, auth_headers: dict
+) -> None:
+    """Test HEAD requests and streams closed before any event hold no slot."""
+    for _ in range(3):
+        response = client.head("/api/todos/events", headers=auth_headers)
+        assert response.status_code == 405
+    assert event_bus.subscriber_count() == 0
+
+    response = client.get("/api/todos/events", headers=auth_headers, buffered=False)
+    assert event_bus.subscriber_count() == 1
+    response.close()
+    assert event_bus.subscriber_count() == 0
+
+
+def test_query_token_rejected_elsewhere(
+    client: FlaskClient, auth_headers: dict
+) -> None:
+    """Test other endpoints keep requiring the Authorization header."""
+    token = auth_headers["Authorization"].split(" ")[1]
+    response = client.get(f"/api/todos?access_token={token}")
+    assert response.status_code == 401
+
+
+def test_stream_unauthorized(client: FlaskClient) -> None:
+    """Test the stream requires authentication."""
+    response = client.get("/api/todos/events?access_token=invalid")
+    assert response.status_code == 401
+
+
+def test_streams_capped_per_process(
+    client: FlaskClient,
+    auth_headers: dict,
+    stream: Iterator[bytes],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test streams beyond SSE_MAX_STREAMS are turned away with a 503."""
+    monkeypatch.setattr("events.SSE_MAX_STREAMS", 1)
+
+    response = client.get("/api/todos/events", headers=auth_headers)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
+    assert event_bus.subscriber_count() == 1
+
+
+def test_bus_marks_slow_subscribers_stale(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a full queue marks the stream stale instead of blocking."""
+    monkeypatch.setattr("events.SSE_QUEUE_SIZE", 2)
+    bus = EventBus()
+    subscription = bus.subscribe(1)
+    for i in range(3):
+        bus.publish(1, f"event {i}")
+
+    assert subscription.stale
+    assert subscription.events.qsize() == 2
+    bus.unsubscribe(subscription)
+    assert bus.subscriber_count() == 0
+
+
+def test_bus_relays_notify_payloads() -> None:
+    """Test NOTIFY payloads are decoded into Server-Sent Events."""
+    bus = EventBus()
+    subscription = bus.subscribe(7)
+    bus.relay('7 deleted {"type":"deleted","id":3}')
+
+    assert subscription.events.get_nowait() == (
+        'event: deleted\ndata: {"type":"deleted","id":3}\n\n'
+    )
+
+
+class _FakeNotifyConnection:
+    """Just enough of a psycopg connection for ``PostgresListener._listen``."""
+
+    def __init__(self, payloads: List[str]) -> None:
+        self.autocommit = False
+        self.notifies = [SimpleNamespace(payload=p) for p in payloads]
+        self._polls = 0
+        self._readable, self._writer = socket.socketpair()
+        self._writer.send(b"x")  # always readable
+
+    def fileno(self) -> int:
+        return self._readable.fileno()
+
+    def cursor(self) -> contextlib.nullcontext:
+        return contextlib.nullcontext(SimpleNamespace(execute=lambda sql: None))
+
+    def poll(self) -> None:
+        self._polls += 1
+        if self._polls > 1:
+            raise OSError("connection lost")
+
+    def close(self) -> None:
+        self._readable.close()
+        self._writer.close()
+
+
+def test_listener_skips_malformed_payloads() -> None:
+    """Test a bad NOTIFY payload is dropped without stopping the listener."""
+    bus = EventBus()
+    subscription = bus.subscribe(7)
+    connection = _FakeNotifyConnection(
+        ["garbage", "7 deleted\nevent: x", '7 deleted {"type":"deleted","id":3}']
+    )
+    pooled = SimpleNamespace(
+        driver_connection=connection, detach=lambda: None, close=lambda: None
+    )
+    engine = SimpleNamespace(raw_connection=lambda: pooled)
+
+    with pytest.raises(OSError):
+        PostgresListener(bus)._listen(cast(Engine, engine))
+    connection.close()
+
+    assert subscription.events.get_nowait() == (
+        'event: deleted\ndata: {"type":"deleted","id":3}\n\n'
+    )
+    assert subscription.events.empty()
@@ -0,0 +1,161 @@
+"""Tests for offloaded password hashing."""
+import threading
+import time
+from typing import Generator
+
+import pytest
+from flask.testing import FlaskClient
+
+from hashing import (HashingBusyError, PasswordHasher, canonical_method,
+                     password_hasher)
+from models import User, db
+
+
+@pytest.fixture
+def pool_hasher() -> Generator[PasswordHasher, None, None]:
+    """Provide a hasher backed by a real single-process pool."""
+    hasher = PasswordHasher(workers=1, max_pending=1, timeout=30)
+    yield hasher
+    hasher.shutdown()
+
+
+def test_inline_hash_and_verify() -> None:
+    """Test hashing without a pool runs in the calling thread."""
+    hasher = PasswordHasher(workers=0, max_pending=1, timeout=1)
+    pw_hash = hasher.hash("password123")
+
+    assert hasher.verify(pw_hash, "password123")
+    assert not hasher.verify(pw_hash, "wrong")
+
+
+def test_pool_hash_and_verify(pool_hasher: PasswordHasher) -> None:
+    """Test hashing and verification round-trip through the process pool."""
+    pw_hash = pool_hasher.hash("password123")
+
+    assert pool_hasher.verify(pw_hash, "password123")
+    assert not pool_hasher.verify(pw_hash, "wrong")
+    assert pool_hasher.stats()["pending"] == 0
+
+
+def test_pool_rejects_when_full() -> None:
+    """Test callers are turned away once max_pending hashes are outstanding."""
+    hasher = PasswordHasher(workers=1, max_pending=1, timeout=0.01)
+    hasher._pending = 1  # occupy the only slot
+    with pytest.raises(HashingBusyError):
+        hasher.hash("password123")
+
+    assert hasher.stats()["rejected"] == 1
+
+
+def test_timed_out_hash_keeps_slot_until_done(pool_hasher: PasswordHasher) -> None:
+    """Test work still running after a timeout counts as pending until it ends."""
+    pool_hasher.hash("password123")  # start the worker process
+    pool_hasher.timeout = 0.05
+    with pytest.raises(HashingBusyError):
+        pool_hasher._run(time.sleep, 0.5)
+    assert pool_hasher.stats()["pending"] == 1
+
+    deadline = time.monotonic() + 5
+    while pool_hasher.stats()["pending"] and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert pool_hasher.stats()["pending"] == 0
+
+
+def test_canonical_method() -> None:
+    """Test method specs are expanded the way werkzeug records them."""
+    assert canonical_method("scrypt") == "scrypt:32768:8:1"
+    assert canonical_method("scrypt:16384") == "scrypt:16384:8:1"
+    assert canonical_method("pbkdf2:sha256:1000") == "pbkdf2:sha256:1000"
+    with pytest.raises(ValueError):
+        canonical_method("md5")
+
+
+def test_configured_method_and_needs_rehash() -> None:
+    """Test hashes use the configured method and older ones need a rehash."""
+    cheap = PasswordHasher(
+        workers=0, max_pending=1, timeout=1, method="pbkdf2:sha256:1000"
+    )
+    default = PasswordHasher(workers=0, max_pending=1, timeout=1, method="scrypt")
+
+    pw_hash = cheap.hash("password123")
+    assert pw_hash.startswith("pbkdf2:sha256:1000$")
+    assert not cheap.needs_rehash(pw_hash)
+    assert default.needs_rehash(pw_hash)
+    assert not default.needs_rehash(default.hash("password123"))
+
+
+def test_user_password_uses_hasher() -> None:
+    """Test User password helpers go through the shared hasher."""
+    user = User(email="hash@example.com", username="hashuser")
+    user.set_password("password123")
+
+    assert password_hasher.verify(user.password_hash, "password123")
+    assert user.check_password("password123")
+
+
+def test_login_busy_returns_503(
+    client: FlaskClient, sample_user: User, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a saturated hashing pool sheds login load with a 503."""
+
+    def busy(*_args: str) -> bool:
+        raise HashingBusyError("Password hashing queue is full")
+
+    monkeypatch.setattr(password_hasher, "verify", busy)
+    response = client.post(
+        "/api/auth/login",
+        json={"email": "test@example.com", "password": "password123"},
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_saturated_pool_leaves_todo_requests_unaffected(
+    client: FlaskClient,
+    sample_user: User,
+    auth_headers: dict,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test logins over the cap fail at once while other endpoints keep working."""
+    monkeypatch.setattr(password_hasher, "workers", 1)
+    monkeypatch.setattr(password_hasher, "max_pending", 1)
+    slow_hash = threading.Thread(target=password_hasher._run, args=(time.sleep, 2))
+    slow_hash.start()
+    try:
+        deadline = time.monotonic() + 5
+        while not password_hasher.stats()["pending"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert password_hasher.stats()["pending"] == 1
+
+        started = time.monotonic()
+        response = client.post(
+            "/api/auth/login",
+            json={"email": "test@example.com", "password": "password123"},
+        )
+        assert response.status_code == 503
+        assert time.monotonic() - started < 1
+
+        response = client.get("/api/todos", headers=auth_headers)
+        assert response.status_code == 200
+    finally:
+        slow_hash.join()
+        password_hasher.shutdown()
+
+
+def test_login_upgrades_outdated_hash(
+    client: FlaskClient, sample_user: User, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a successful login rehashes the password with the current method."""
+    monkeypatch.setattr(password_hasher, "method", "pbkdf2:sha256:1000")
+
+    response = client.post(
+        "/api/auth/login",
+        json={"email": "test@example.com", "password": "password123"},
+    )
+    assert response.status_code == 200
+
+    user = db.session.get(User, sample_user.id)
+    assert user is not None
+    assert user.password_hash.startswith("pbkdf2:sha256:1000$")
+    assert user.check_password("password123")
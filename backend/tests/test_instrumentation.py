@@ -0,0 +1,67 @@
+"""Tests for request instrumentation."""
+import re
+from typing import Generator
+
+import pytest
+
+from instrumentation import Histogram, reset_timing_stats
+
+
+@pytest.fixture
+def instrumented(monkeypatch: pytest.MonkeyPatch) -> Generator[None, None, None]:
+    """Turn instrumentation on with empty histograms."""
+    monkeypatch.setattr("instrumentation.INSTRUMENTATION_ENABLED", True)
+    reset_timing_stats()
+    yield
+    reset_timing_stats()
+
+
+def _server_timing(header: str) -> dict[str, str]:
+    return {entry.split(";")[0]: entry for entry in header.split(", ")}
+
+
+def test_histogram_cumulative_buckets() -> None:
+    """Test values land in the first bucket whose bound covers them."""
+    histogram = Histogram((1, 5, 10))
+    for value in (0.5, 1, 3, 20):
+        histogram.observe(value)
+
+    assert histogram.snapshot() == {
+        "count": 4,
+        "sum": 24.5,
+        "buckets": {"1": 2, "5": 3, "10": 3, "+Inf": 4},
+    }
+
+
+def test_server_timing_phases(client, auth_headers, instrumented) -> None:
+    """Test an authenticated request reports every phase it went through."""
+    client.post("/api/todos", headers=auth_headers, json={"title": "A"})
+
+    response = client.get("/api/todos?limit=10", headers=auth_headers)
+
+    phases = _server_timing(response.headers["Server-Timing"])
+    assert set(phases) == {"total", "auth", "validation", "db", "serialize"}
+    assert re.fullmatch(r'db;dur=[\d.]+;desc="\d+ queries"', phases["db"])
+
+
+def test_metrics_report_histograms(client, auth_headers, instrumented) -> None:
+    """Test per-endpoint histograms count requests and SQL statements."""
+    client.get("/api/todos", headers=auth_headers)
+    client.get("/api/todos", headers=auth_headers)
+
+    timing = client.get("/health/metrics").get_json()["request_timing"]
+
+    assert timing["get_todos"]["total"]["count"] == 2
+    assert timing["get_todos"]["auth"]["count"] == 2
+    queries = timing["get_todos"]["sql_queries"]
+    assert queries["count"] == 2
+    assert queries["buckets"]["0"] == 0
+
+
+def test_disabled_by_default(client, auth_headers) -> None:
+    """Test no header or histogram is recorded unless enabled."""
+    reset_timing_stats()
+    response = client.get("/api/todos", headers=auth_headers)
+
+    assert "Server-Timing" not in response.headers
+    assert client.get("/health/metrics").get_json()["request_timing"] == {}
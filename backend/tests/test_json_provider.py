@@ -0,0 +1,67 @@
+"""Tests for the JSON provider."""
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from flask import Flask
+
+from json_provider import HAS_ORJSON, FastJSONProvider
+
+PAYLOAD = {
+    "created_at": datetime(2024, 1, 2, 3, 4, 5, 678901),
+    "due": date(2024, 1, 31),
+    "amount": Decimal("1.50"),
+    "title": "Café",
+    1: "int key",
+}
+EXPECTED = {
+    "created_at": "2024-01-02T03:04:05.678901",
+    "due": "2024-01-31",
+    "amount": "1.50",
+    "title": "Café",
+    "1": "int key",
+}
+
+ENCODERS = [
+    pytest.param(True, marks=pytest.mark.skipif(not HAS_ORJSON, reason="orjson")),
+    False,
+]
+
+
+@pytest.fixture(params=ENCODERS, ids=["orjson", "stdlib"])
+def json_app(request: pytest.FixtureRequest) -> Flask:
+    """Bare app using the provider, once per encoder."""
+    bare_app = Flask(__name__)
+    bare_app.json = FastJSONProvider(bare_app)
+    bare_app.json.use_orjson = request.param
+    return bare_app
+
+
+def test_dumps_iso_datetimes(json_app: Flask) -> None:
+    """Test both encoders write the same ISO 8601 output."""
+    assert json.loads(json_app.json.dumps(PAYLOAD)) == EXPECTED
+
+
+def test_response_body(json_app: Flask) -> None:
+    """Test responses are JSON documents ending in a newline."""
+    with json_app.app_context():
+        response = json_app.json.response(PAYLOAD)
+
+    assert response.mimetype == "application/json"
+    assert response.get_data().endswith(b"\n")
+    assert response.get_json() == EXPECTED
+
+
+def test_dumps_keyword_arguments_use_stdlib(json_app: Flask) -> None:
+    """Test stdlib options such as indent are honoured."""
+    assert json_app.json.dumps({"a": 1}, indent=2) == '{\n  "a": 1\n}'
+
+
+def test_app_encodes_todo_timestamps(client, auth_headers) -> None:
+    """Test todo and owner timestamps reach clients in ISO 8601."""
+    response = client.post("/api/todos", headers=auth_headers, json={"title": "A"})
+    todo = response.get_json()["todo"]
+
+    for value in (todo["created_at"], todo["updated_at"], todo["owner"]["created_at"]):
+        assert datetime.fromisoformat(value).isoformat() == value
@@ -0,0 +1,119 @@
+"""Tests for the Alembic migrations."""
+from pathlib import Path
+from typing import Generator, Optional
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import Engine, create_engine, inspect, text
+
+from models import db
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> Generator[Engine, None, None]:
+    """Engine for a scratch SQLite file, separate from the app database."""
+    scratch = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield scratch
+    scratch.dispose()
+
+
+def _config() -> Config:
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    return config
+
+
+def _stamp(engine: Engine, revision: str) -> None:
+    config = _config()
+    with engine.connect() as connection:
+        config.attributes["connection"] = connection
+        command.stamp(config, revision)
+        connection.commit()
+
+
+def _migrate(engine: Engine, revision: str, downgrade: bool = False) -> None:
+    config = _config()
+    with engine.connect() as connection:
+        config.attributes["connection"] = connection
+        if downgrade:
+            command.downgrade(config, revision)
+        else:
+            command.upgrade(config, revision)
+
+
+def test_upgrade_head_matches_models(engine: Engine) -> None:
+    """Migrating an empty database yields exactly the schema in models.py."""
+    _migrate(engine, "head")
+
+    with engine.connect() as connection:
+        diff = compare_metadata(MigrationContext.configure(connection), db.metadata)
+
+    assert diff == []
+
+
+def test_upgrade_from_initial_schema_keeps_todos(engine: Engine) -> None:
+    """A database at 0001 (as create_all left it) upgrades to the full schema."""
+    _migrate(engine, "0001")
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO users (id, email, username, password_hash, "
+                "created_at, updated_at) VALUES (1, 'a@example.com', 'a', 'x', "
+                "'2026-01-01 00:00:00', '2026-01-01 00:00:00')"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO todos (id, title, owner_id, status, importance, "
+                "urgency, created_at, updated_at) VALUES (1, 'Old', 1, 'pending', "
+                "4, 1, '2026-01-01 00:00:00', '2026-01-01 00:00:00')"
+            )
+        )
+
+    _migrate(engine, "head")
+
+    with engine.connect() as connection:
+        diff = compare_metadata(MigrationContext.configure(connection), db.metadata)
+        row = connection.execute(text("SELECT title, priority_score FROM todos")).one()
+    assert diff == []
+    assert tuple(row) == ("Old", pytest.approx(2.8))
+    assert {"ix_todos_owner_priority", "ix_todos_owner_open_priority"} <= (
+        _index_names(engine)
+    )
+
+
+def test_upgrade_create_all_database_stamped_initial(engine: Engine) -> None:
+    """A database made by create_all() from current models, stamped 0001, upgrades."""
+    db.metadata.create_all(engine)
+    _stamp(engine, "0001")
+
+    _migrate(engine, "head")
+
+    with engine.connect() as connection:
+        diff = compare_metadata(MigrationContext.configure(connection), db.metadata)
+    assert diff == []
+
+
+def test_owner_updated_index_migration_round_trips(engine: Engine) -> None:
+    """The (owner_id, updated_at) index is added by 0002 and removed again."""
+    _migrate(engine, "0001")
+    assert "ix_todos_owner_updated" not in _index_names(engine)
+
+    _migrate(engine, "head")
+    indexes = {ix["name"]: ix for ix in inspect(engine).get_indexes("todos")}
+    assert indexes["ix_todos_owner_updated"]["column_names"] == [
+        "owner_id",
+        "updated_at",
+    ]
+
+    _migrate(engine, "0001", downgrade=True)
+    assert "ix_todos_owner_updated" not in _index_names(engine)
+
+
+def _index_names(engine: Engine) -> set[Optional[str]]:
+    return {ix["name"] for ix in inspect(engine).get_indexes("todos")}
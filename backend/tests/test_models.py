@@ -0,0 +1,52 @@
+"""Tests for model serialization helpers."""
+from typing import Any, cast
+
+import pytest
+from flask import Flask
+
+from models import (LEVEL_ICONS, LEVEL_NAMES, TODO_ROW_FIELDS, Todo, User, db,
+                    serialize_todo_row)
+
+
+def test_serialize_todo_row(app: Flask, sample_user: User) -> None:
+    """Test the row serializer's full and compact forms, as ``to_dict`` gives them."""
+    todo = Todo(title="Row", importance=4, urgency=1, owner_id=sample_user.id)
+    with app.app_context():
+        db.session.add(todo)
+        db.session.commit()
+        row = tuple(getattr(todo, field) for field in TODO_ROW_FIELDS)
+        owner = {
+            "id": sample_user.id,
+            "username": "testuser",
+            "created_at": sample_user.created_at,
+        }
+        expected = {
+            "id": todo.id,
+            "title": "Row",
+            "description": None,
+            "status": "pending",
+            "importance": 4,
+            "urgency": 1,
+            "priority_score": pytest.approx(2.8),
+            "created_at": todo.created_at,
+            "updated_at": todo.updated_at,
+            "owner": owner,
+            "importance_label": "Critical",
+            "urgency_label": "Low",
+            "importance_icon": LEVEL_ICONS[4],
+            "urgency_icon": LEVEL_ICONS[1],
+        }
+
+        assert serialize_todo_row(row, sample_user.to_dict()) == expected
+        assert todo.to_dict() == expected
+        compact = serialize_todo_row(row, compact=True)
+        assert set(compact) == set(TODO_ROW_FIELDS)
+        assert compact == {field: expected[field] for field in TODO_ROW_FIELDS}
+
+
+def test_level_tables_are_read_only() -> None:
+    """Test the shared level tables cannot be changed by a caller."""
+    with pytest.raises(TypeError):
+        cast(Any, LEVEL_NAMES)[1] = "Changed"
+    assert Todo.get_level_name(9) == "Medium"
+    assert Todo.get_level_icon(9) == Todo.get_level_icon(2)
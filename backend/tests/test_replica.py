@@ -0,0 +1,101 @@
+"""Tests for read-replica routing."""
+from typing import Generator
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.engine import Engine
+
+from models import Todo, User, db
+from replica import LAST_WRITE_HEADER, REPLICA_BIND_KEY, recent_writers
+
+
+@pytest.fixture
+def replica(
+    app: Flask, tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> Generator[Engine, None, None]:
+    """Attach a separate SQLite database as the read replica."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    db.metadata.create_all(engine)
+    monkeypatch.setitem(db.engines, REPLICA_BIND_KEY, engine)
+    recent_writers.clear()
+    yield engine
+    recent_writers.clear()
+    engine.dispose()
+
+
+def _seed_replica(engine: Engine, user: User, title: str) -> None:
+    with engine.begin() as conn:
+        conn.execute(insert(Todo), [{"title": title, "owner_id": user.id}])
+
+
+def test_reads_go_to_replica(
+    client: FlaskClient, sample_user: User, auth_headers: dict, replica: Engine
+) -> None:
+    """Test read-only handlers query the replica."""
+    _seed_replica(replica, sample_user, "From replica")
+    db.session.remove()
+
+    response = client.get("/api/todos", headers=auth_headers)
+    assert response.status_code == 200
+    # The user only exists on the primary; the lookup falls back to it
+    todos = response.get_json()["todos"]
+    assert [todo["title"] for todo in todos] == ["From replica"]
+
+
+def test_writes_go_to_primary_and_pin_reads(
+    client: FlaskClient, sample_user: User, auth_headers: dict, replica: Engine
+) -> None:
+    """Test writes use the primary and the writer then reads its own writes."""
+    _seed_replica(replica, sample_user, "From replica")
+
+    response = client.post("/api/todos", headers=auth_headers, json={"title": "New"})
+    assert response.status_code == 201
+    todo_id = response.get_json()["todo"]["id"]
+    assert recent_writers.get(sample_user.id) is True
+
+    response = client.get("/api/todos", headers=auth_headers)
+    assert [todo["title"] for todo in response.get_json()["todos"]] == ["New"]
+
+    response = client.get(f"/api/todos/{todo_id}", headers=auth_headers)
+    assert response.get_json()["todo"]["title"] == "New"
+
+
+def test_missing_todo_falls_back_to_primary(
+    app: Flask, client: FlaskClient, sample_user: User, auth_headers: dict, replica
+) -> None:
+    """Test a todo not yet replicated is still found on the primary."""
+    todo = Todo(title="Primary only", owner_id=sample_user.id)
+    db.session.add(todo)
+    db.session.commit()
+    todo_id = todo.id
+    db.session.remove()
+
+    response = client.get(f"/api/todos/{todo_id}", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.get_json()["todo"]["title"] == "Primary only"
+
+
+def test_last_write_header_pins_reads_in_other_workers(
+    client: FlaskClient, sample_user: User, auth_headers: dict, replica: Engine
+) -> None:
+    """Test a client echoing its last-write marker reads from the primary."""
+    _seed_replica(replica, sample_user, "From replica")
+    response = client.post("/api/todos", headers=auth_headers, json={"title": "New"})
+    marker = response.headers[LAST_WRITE_HEADER]
+    recent_writers.clear()  # as seen by a worker that did not handle the write
+
+    response = client.get("/api/todos", headers=auth_headers)
+    assert LAST_WRITE_HEADER not in response.headers
+    assert [todo["title"] for todo in response.get_json()["todos"]] == ["From replica"]
+
+    response = client.get(
+        "/api/todos", headers={**auth_headers, LAST_WRITE_HEADER: marker}
+    )
+    assert [todo["title"] for todo in response.get_json()["todos"]] == ["New"]
+
+    response = client.get(
+        "/api/todos", headers={**auth_headers, LAST_WRITE_HEADER: marker + "x"}
+    )
+    assert [todo["title"] for todo in response.get_json()["todos"]] == ["From replica"]
@@ -0,0 +1,81 @@
+"""Tests for the rendered todo list cache."""
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+
+from models import Todo, User, db
+from response_cache import (LocalResponseCache, RedisResponseCache,
+                            todo_list_cache)
+
+
+def test_local_cache_keeps_recent_variants() -> None:
+    """Test each user keeps their most recently stored bodies."""
+    cache = LocalResponseCache(max_users=10, ttl=60, variants=2)
+    cache.set(1, "a", b"A")
+    cache.set(1, "b", b"B")
+    cache.set(1, "a", b"A2")
+    cache.set(1, "c", b"C")
+    cache.set(2, "a", b"other user")
+
+    assert cache.get(1, "b") is None
+    assert cache.get(1, "a") == b"A2"
+    assert cache.get(1, "c") == b"C"
+    assert cache.get(2, "a") == b"other user"
+
+    cache.invalidate(1)
+    assert cache.get(1, "c") is None
+    assert cache.stats() == {"backend": "local", "users": 1, "hits": 3, "misses": 2}
+
+
+def test_redis_cache_errors_are_misses() -> None:
+    """Test an unreachable Redis server degrades to cache misses."""
+    redis = pytest.importorskip("redis")
+    client = redis.Redis(port=1, socket_connect_timeout=0.1, retry_on_timeout=False)
+    cache = RedisResponseCache(client, ttl=60)
+
+    cache.set(1, "a", b"A")
+    assert cache.get(1, "a") is None
+    cache.invalidate(1)
+    assert cache.stats() == {"backend": "redis", "hits": 0, "misses": 0, "errors": 3}
+
+
+def test_get_todos_served_from_cache(client: FlaskClient, auth_headers: dict) -> None:
+    """Test an unchanged list is served from the cache until a write."""
+    client.post("/api/todos", headers=auth_headers, json={"title": "First"})
+
+    first = client.get("/api/todos", headers=auth_headers)
+    second = client.get("/api/todos", headers=auth_headers)
+    assert second.get_data() == first.get_data()
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert todo_list_cache.stats()["hits"] == 1
+
+    client.post("/api/todos", headers=auth_headers, json={"title": "Second"})
+    assert todo_list_cache.stats()["users"] == 0
+    data = client.get("/api/todos", headers=auth_headers).get_json()
+    assert sorted(t["title"] for t in data["todos"]) == ["First", "Second"]
+
+
+def test_get_todos_cache_keyed_by_query(
+    client: FlaskClient, auth_headers: dict
+) -> None:
+    """Test each view and filter combination is cached separately."""
+    client.post("/api/todos", headers=auth_headers, json={"title": "Todo"})
+
+    full = client.get("/api/todos", headers=auth_headers).get_json()
+    compact = client.get("/api/todos?view=compact", headers=auth_headers).get_json()
+    assert "owner" in full["todos"][0]
+    assert "owner" not in compact["todos"][0]
+
+
+def test_get_todos_cache_not_stale_after_external_write(
+    app: Flask, client: FlaskClient, sample_user: User, auth_headers: dict
+) -> None:
+    """Test a write made elsewhere (another worker) is seen without invalidation."""
+    client.get("/api/todos", headers=auth_headers)
+    with app.app_context():
+        db.session.add(Todo(title="From another worker", owner_id=sample_user.id))
+        db.session.commit()
+
+    response = client.get("/api/todos", headers=auth_headers)
+    assert [t["title"] for t in response.get_json()["todos"]] == ["From another worker"]
+    assert todo_list_cache.stats()["hits"] == 0
@@ -1,7 +1,11 @@
 """Tests for Todo API endpoints."""
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+
 import pytest
 
-from models import Todo, User, db
+from models import Todo, TodoTombstone, User, db
 
 # ============================================================================
 # GET /api/todos - List todos
@@ -105,6 +109,174 @@ def test_get_todos_only_own(client, sample_user, app, auth_headers):
     assert todos[0]["title"] == "My todo"
 
 
+def test_get_todos_paginated(client, sample_user, auth_headers, app):
+    """Test walking the list page by page with cursors."""
+    with app.app_context():
+        user = User.query.filter_by(email="test@example.com").first()
+        # Several todos share a priority score so pages split inside a tie
+        todos = [
+            Todo(title=f"Todo {i}", importance=1 + i % 2, urgency=2, owner_id=user.id)
+            for i in range(7)
+        ]
+        db.session.add_all(todos)
+        db.session.commit()
+
+    full = client.get("/api/todos", headers=auth_headers).get_json()
+    assert full["next_cursor"] is None
+    expected = [todo["id"] for todo in full["todos"]]
+
+    seen = []
+    cursor = None
+    for _ in range(10):
+        url = "/api/todos?limit=3" + (f"&cursor={cursor}" if cursor else "")
+        response = client.get(url, headers=auth_headers)
+        assert response.status_code == 200
+        data = response.get_json()
+        assert len(data["todos"]) <= 3
+        seen.extend(todo["id"] for todo in data["todos"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == expected
+
+
+def test_get_todos_exact_page_has_no_next_cursor(client, sample_user, auth_headers):
+    """Test the last page reports no next cursor when it is exactly full."""
+    for i in range(2):
+        client.post("/api/todos", headers=auth_headers, json={"title": f"Todo {i}"})
+
+    response = client.get("/api/todos?limit=2", headers=auth_headers)
+    data = response.get_json()
+    assert len(data["todos"]) == 2
+    assert data["next_cursor"] is None
+
+
+def _encode_raw_cursor(position):
+    """Encode a cursor from raw JSON values, as a client might build one."""
+    raw = json.dumps(position).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def test_get_todos_offset_aware_cursor(client, auth_headers):
+    """Test a cursor with a UTC offset pages like the naive one it encodes."""
+    for i in range(3):
+        client.post("/api/todos", headers=auth_headers, json={"title": f"Todo {i}"})
+    first = client.get("/api/todos?limit=1", headers=auth_headers).get_json()
+    position = json.loads(base64.urlsafe_b64decode(first["next_cursor"] + "=="))
+    position["created_at"] = (
+        datetime.fromisoformat(position["created_at"])
+        .replace(tzinfo=timezone.utc)
+        .astimezone(timezone(timedelta(hours=2)))
+        .isoformat()
+    )
+
+    response = client.get(
+        f"/api/todos?limit=1&cursor={_encode_raw_cursor(position)}",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    expected = client.get(
+        f"/api/todos?limit=1&cursor={first['next_cursor']}", headers=auth_headers
+    ).get_json()
+    assert response.get_json()["todos"] == expected["todos"]
+
+
+def test_get_todos_invalid_cursor(client, auth_headers):
+    """Test a malformed cursor is rejected."""
+    response = client.get(
+        "/api/todos?limit=10&cursor=not-a-cursor", headers=auth_headers
+    )
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Invalid cursor"
+
+
+@pytest.mark.parametrize("limit", ["0", "501", "abc"])
+def test_get_todos_invalid_limit(client, auth_headers, limit):
+    """Test out-of-range or non-numeric limits are rejected."""
+    response = client.get(f"/api/todos?limit={limit}", headers=auth_headers)
+    assert response.status_code == 400
+
+
+def _seed_filter_todos(app):
+    """Create todos spread across statuses, levels and creation times."""
+    with app.app_context():
+        user = User.query.filter_by(email="test@example.com").first()
+        specs = [
+            ("Pending high", "pending", 4, 1, datetime(2024, 1, 1)),
+            ("Pending low", "pending", 1, 4, datetime(2024, 2, 1)),
+            ("In progress", "in_progress", 3, 3, datetime(2024, 3, 1)),
+            ("Done", "completed", 2, 2, datetime(2024, 4, 1)),
+        ]
+        db.session.add_all(
+            [
+                Todo(
+                    title=title,
+                    status=status,
+                    importance=importance,
+                    urgency=urgency,
+                    created_at=created_at,
+                    owner_id=user.id,
+                )
+                for title, status, importance, urgency, created_at in specs
+            ]
+        )
+        db.session.commit()
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("status=pending", ["Pending high", "Pending low"]),
+        ("status=pending,in_progress", ["In progress", "Pending high", "Pending low"]),
+        ("min_importance=3", ["In progress", "Pending high"]),
+        ("max_importance=2&min_urgency=2", ["Pending low", "Done"]),
+        ("max_urgency=1", ["Pending high"]),
+        ("created_after=2024-02-01T00:00:00", ["In progress", "Done"]),
+        ("created_before=2024-02-01T00:00:00Z", ["Pending high"]),
+        (
+            "created_after=2024-01-15T00:00:00%2B02:00&status=pending",
+            ["Pending low"],
+        ),
+        ("updated_after=2100-01-01T00:00:00", []),
+    ],
+)
+def test_get_todos_filtered(client, sample_user, auth_headers, app, query, expected):
+    """Test list filters are applied in the query."""
+    _seed_filter_todos(app)
+
+    response = client.get(f"/api/todos?{query}", headers=auth_headers)
+    assert response.status_code == 200
+    assert [todo["title"] for todo in response.get_json()["todos"]] == expected
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["status=done", "status=pending,", "min_importance=0", "created_after=yesterday"],
+)
+def test_get_todos_invalid_filter(client, auth_headers, query):
+    """Test malformed filters are rejected."""
+    response = client.get(f"/api/todos?{query}", headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_get_todos_filtered_pagination(client, sample_user, auth_headers, app):
+    """Test cursors page through a filtered list."""
+    _seed_filter_todos(app)
+
+    first = client.get("/api/todos?status=pending&limit=1", headers=auth_headers)
+    data = first.get_json()
+    assert [todo["title"] for todo in data["todos"]] == ["Pending high"]
+
+    second = client.get(
+        f"/api/todos?status=pending&limit=1&cursor={data['next_cursor']}",
+        headers=auth_headers,
+    )
+    data = second.get_json()
+    assert [todo["title"] for todo in data["todos"]] == ["Pending low"]
+    assert data["next_cursor"] is None
+
+
 # ============================================================================
 # GET /api/todos/<id> - Get specific todo
 # ============================================================================
@@ -544,3 +716,604 @@ def test_create_multiple_todos_same_user(client, sample_user, auth_headers):
     assert response3.status_code == 200
     data = response3.get_json()
     assert len(data["todos"]) == 2
+
+
+# ============================================================================
+# Compact representation and level table
+# ============================================================================
+
+
+def test_get_todos_matches_single_todo(client, auth_headers):
+    """Test listed todos serialize exactly like the single-todo endpoint."""
+    for i in range(3):
+        client.post(
+            "/api/todos",
+            headers=auth_headers,
+            json={"title": f"Todo {i}", "description": "Same", "importance": i + 1},
+        )
+
+    for view in ("full", "compact"):
+        listed = client.get(f"/api/todos?view={view}", headers=auth_headers)
+        for todo in listed.get_json()["todos"]:
+            single = client.get(
+                f"/api/todos/{todo['id']}?view={view}", headers=auth_headers
+            )
+            assert single.get_json()["todo"] == todo
+
+
+def test_get_todos_compact_view(client, sample_user, auth_headers, app):
+    """Test the compact view omits owner, labels and icons."""
+    with app.app_context():
+        user = User.query.filter_by(email="test@example.com").first()
+        db.session.add_all(
+            [Todo(title=f"Todo {i}", importance=3, owner_id=user.id) for i in range(20)]
+        )
+        db.session.commit()
+
+    full = client.get("/api/todos", headers=auth_headers)
+    compact = client.get("/api/todos?view=compact", headers=auth_headers)
+    assert compact.status_code == 200
+
+    todo = compact.get_json()["todos"][0]
+    assert todo["importance"] == 3
+    assert todo["priority_score"] == pytest.approx(2.6)
+    for key in (
+        "owner",
+        "importance_label",
+        "urgency_label",
+        "importance_icon",
+        "urgency_icon",
+    ):
+        assert key not in todo
+    assert len(compact.data) * 2 < len(full.data)
+
+
+def test_todo_write_compact_view(client, auth_headers):
+    """Test create and update honor the view parameter."""
+    response = client.post(
+        "/api/todos?view=compact", headers=auth_headers, json={"title": "Compact"}
+    )
+    assert response.status_code == 201
+    todo = response.get_json()["todo"]
+    assert "owner" not in todo
+
+    response = client.patch(
+        f"/api/todos/{todo['id']}?view=compact",
+        headers=auth_headers,
+        json={"status": "completed"},
+    )
+    assert response.status_code == 200
+    assert "importance_icon" not in response.get_json()["todo"]
+
+    response = client.get(f"/api/todos/{todo['id']}?view=compact", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.get_json()["todo"]["status"] == "completed"
+
+
+def test_get_todo_invalid_view(client, auth_headers):
+    """Test an unknown view is rejected."""
+    response = client.get("/api/todos?view=tiny", headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_get_todo_levels(client):
+    """Test the level table is public, cacheable and matches todo icons."""
+    response = client.get("/api/todos/levels")
+    assert response.status_code == 200
+    assert "max-age" in response.headers["Cache-Control"]
+
+    levels = response.get_json()["levels"]
+    assert [level["level"] for level in levels] == [1, 2, 3, 4]
+    assert [level["name"] for level in levels] == ["Low", "Medium", "High", "Critical"]
+    assert levels[2]["icon"] == Todo.get_level_icon(3)
+
+
+# ============================================================================
+# POST /api/todos/batch - Batch operations
+# ============================================================================
+
+
+def test_batch_todos_mixed(client, sample_user, auth_headers, app):
+    """Test creates, updates and deletes are applied together."""
+    with app.app_context():
+        user = User.query.filter_by(email="test@example.com").first()
+        keep = Todo(title="Keep", importance=1, urgency=1, owner_id=user.id)
+        drop = Todo(title="Drop", owner_id=user.id)
+        db.session.add_all([keep, drop])
+        db.session.commit()
+        keep_id, drop_id = keep.id, drop.id
+        keep_updated_at = keep.updated_at
+
+    response = client.post(
+        "/api/todos/batch",
+        headers=auth_headers,
+        json={
+            "operations": [
+                {"op": "create", "data": {"title": "New 1", "importance": 4}},
+                {"op": "update", "id": keep_id, "data": {"importance": 4}},
+                {"op": "delete", "id": drop_id},
+                {"op": "create", "data": {"title": "New 2"}},
+                {"op": "update", "id": keep_id, "data": {"status": "completed"}},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+
+    assert [result["op"] for result in results] == [
+        "create",
+        "update",
+        "delete",
+        "create",
+        "update",
+    ]
+    assert results[0]["todo"]["title"] == "New 1"
+    assert results[0]["todo"]["owner"]["username"] == "testuser"
+    assert results[3]["todo"]["title"] == "New 2"
+    assert results[1]["todo"]["importance"] == 4
+    assert results[1]["todo"]["status"] == "completed"
+    assert results[1]["todo"]["priority_score"] == pytest.approx(2.8)
+    assert results[2] == {"op": "delete", "id": drop_id}
+
+    with app.app_context():
+        assert db.session.get(Todo, drop_id) is None
+        assert db.session.get(Todo, keep_id).updated_at > keep_updated_at
+        assert Todo.query.count() == 3
+
+
+def test_batch_todos_rejected_atomically(client, sample_user, auth_headers, app):
+    """Test one invalid operation rejects the whole batch."""
+    with app.app_context():
+        other_user = User(email="other@example.com", username="otheruser")
+        other_user.set_password("password123")
+        db.session.add(other_user)
+        db.session.commit()
+        todo = Todo(title="Other user's todo", owner_id=other_user.id)
+        db.session.add(todo)
+        db.session.commit()
+        other_todo_id = todo.id
+
+    response = client.post(
+        "/api/todos/batch",
+        headers=auth_headers,
+        json={
+            "operations": [
+                {"op": "create", "data": {"title": "Valid"}},
+                {"op": "create", "data": {"title": "Bad", "urgency": 9}},
+                {"op": "update", "id": other_todo_id, "data": {"title": "Hacked!"}},
+                {"op": "delete", "id": 9999},
+                {"op": "delete"},
+            ]
+        },
+    )
+    assert response.status_code == 400
+    errors = response.get_json()["results"]
+    assert [error["index"] for error in errors] == [1, 2, 3, 4]
+    assert errors[1]["error"] == "Unauthorized"
+    assert errors[2]["error"] == "Todo not found"
+    assert errors[3]["error"] == "Todo id is required"
+
+    with app.app_context():
+        assert Todo.query.count() == 1
+        assert db.session.get(Todo, other_todo_id).title == "Other user's todo"
+
+
+def test_batch_todos_update_after_delete(client, sample_user, auth_headers, app):
+    """Test a todo deleted earlier in the batch cannot be updated."""
+    with app.app_context():
+        user = User.query.filter_by(email="test@example.com").first()
+        todo = Todo(title="Gone", owner_id=user.id)
+        db.session.add(todo)
+        db.session.commit()
+        todo_id = todo.id
+
+    response = client.post(
+        "/api/todos/batch",
+        headers=auth_headers,
+        json={
+            "operations": [
+                {"op": "delete", "id": todo_id},
+                {"op": "update", "id": todo_id, "data": {"title": "Back"}},
+            ]
+        },
+    )
+    assert response.status_code == 400
+    assert response.get_json()["results"][0]["index"] == 1
+
+
+def test_batch_todos_empty_update(client, sample_user, auth_headers, app):
+    """Test an update without changes leaves the todo untouched."""
+    with app.app_context():
+        user = User.query.filter_by(email="test@example.com").first()
+        todo = Todo(title="Same", owner_id=user.id)
+        db.session.add(todo)
+        db.session.commit()
+        todo_id = todo.id
+
+    response = client.post(
+        "/api/todos/batch",
+        headers=auth_headers,
+        json={"operations": [{"op": "update", "id": todo_id, "data": {}}]},
+    )
+    assert response.status_code == 200
+    assert response.get_json()["results"][0]["todo"]["title"] == "Same"
+
+
+def test_batch_todos_invalid_request(client, auth_headers):
+    """Test malformed batches are rejected."""
+    response = client.post(
+        "/api/todos/batch", headers=auth_headers, json={"operations": []}
+    )
+    assert response.status_code == 400
+
+    response = client.post(
+        "/api/todos/batch",
+        headers=auth_headers,
+        json={"operations": [{"op": "upsert", "data": {}}]},
+    )
+    assert response.status_code == 400
+
+
+def test_batch_todos_unauthorized(client):
+    """Test batch operations require authentication."""
+    response = client.post("/api/todos/batch", json={"operations": []})
+    assert response.status_code == 401
+
+
+# ============================================================================
+# Conditional GET (ETag / If-None-Match)
+# ============================================================================
+
+
+def test_get_todos_etag_not_modified(client, auth_headers):
+    """Test an unchanged list revalidates with 304 and changes bust the tag."""
+    created = client.post("/api/todos", headers=auth_headers, json={"title": "A"})
+    todo_id = created.get_json()["todo"]["id"]
+
+    response = client.get("/api/todos", headers=auth_headers)
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    headers = {**auth_headers, "If-None-Match": etag}
+    response = client.get("/api/todos", headers=headers)
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.headers["ETag"] == etag
+
+    # Another representation of the same data has its own tag
+    response = client.get("/api/todos?view=compact", headers=headers)
+    assert response.status_code == 200
+
+    client.patch(f"/api/todos/{todo_id}", headers=auth_headers, json={"title": "B"})
+    response = client.get("/api/todos", headers=headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    client.delete(f"/api/todos/{todo_id}", headers=auth_headers)
+    response = client.get("/api/todos", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.get_json()["todos"] == []
+
+
+def test_get_todo_etag_not_modified(client, auth_headers):
+    """Test a single todo revalidates with 304 until it changes."""
+    created = client.post("/api/todos", headers=auth_headers, json={"title": "A"})
+    todo_id = created.get_json()["todo"]["id"]
+
+    etag = client.get(f"/api/todos/{todo_id}", headers=auth_headers).headers["ETag"]
+    headers = {**auth_headers, "If-None-Match": etag}
+    assert client.get(f"/api/todos/{todo_id}", headers=headers).status_code == 304
+
+    client.patch(f"/api/todos/{todo_id}", headers=auth_headers, json={"title": "B"})
+    response = client.get(f"/api/todos/{todo_id}", headers=headers)
+    assert response.status_code == 200
+    assert response.get_json()["todo"]["title"] == "B"
+
+
+def test_get_todo_etag_other_owner(client, sample_user, auth_headers, app):
+    """Test revalidation does not leak other users' todos."""
+    with app.app_context():
+        other_user = User(email="other@example.com", username="otheruser")
+        other_user.set_password("password123")
+        db.session.add(other_user)
+        db.session.commit()
+        todo = Todo(title="Other user's todo", owner_id=other_user.id)
+        db.session.add(todo)
+        db.session.commit()
+        todo_id = todo.id
+
+    headers = {**auth_headers, "If-None-Match": "*"}
+    response = client.get(f"/api/todos/{todo_id}", headers=headers)
+    assert response.status_code == 403
+
+
+# ============================================================================
+# GET /api/todos/search - Search todos
+# ============================================================================
+
+
+def test_search_todos(client, sample_user, auth_headers, app):
+    """Test search matches titles and descriptions of the user's todos only."""
+    with app.app_context():
+        other_user = User(email="other@example.com", username="otheruser")
+        other_user.set_password("password123")
+        db.session.add(other_user)
+        db.session.commit()
+        user = User.query.filter_by(email="test@example.com").first()
+        db.session.add_all(
+            [
+                Todo(title="Buy milk", importance=4, owner_id=user.id),
+                Todo(title="Errands", description="Milk and eggs", owner_id=user.id),
+                Todo(title="Walk the dog", owner_id=user.id),
+                Todo(title="Other user's milk", owner_id=other_user.id),
+            ]
+        )
+        db.session.commit()
+
+    response = client.get("/api/todos/search?q=MILK", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [todo["title"] for todo in data["todos"]] == ["Buy milk", "Errands"]
+    assert data["next_page"] is None
+
+    response = client.get("/api/todos/search?q=milk&limit=1", headers=auth_headers)
+    data = response.get_json()
+    assert [todo["title"] for todo in data["todos"]] == ["Buy milk"]
+    assert data["next_page"] == 2
+
+    response = client.get(
+        "/api/todos/search?q=milk&limit=1&page=2&view=compact", headers=auth_headers
+    )
+    data = response.get_json()
+    assert [todo["title"] for todo in data["todos"]] == ["Errands"]
+    assert "owner" not in data["todos"][0]
+    assert data["next_page"] is None
+
+
+def test_search_todos_wildcards_are_literal(client, auth_headers):
+    """Test LIKE wildcards in the search text match literally."""
+    client.post("/api/todos", headers=auth_headers, json={"title": "100% done"})
+    client.post("/api/todos", headers=auth_headers, json={"title": "1000 done"})
+
+    response = client.get("/api/todos/search?q=0%25", headers=auth_headers)
+    assert [todo["title"] for todo in response.get_json()["todos"]] == ["100% done"]
+
+
+@pytest.mark.parametrize("query", ["", "q=", "q=milk&limit=0", "q=milk&page=0"])
+def test_search_todos_invalid(client, auth_headers, query):
+    """Test search parameters are validated."""
+    response = client.get(f"/api/todos/search?{query}", headers=auth_headers)
+    assert response.status_code == 400
+
+
+# ============================================================================
+# GET /api/todos/export - Streaming export
+# ============================================================================
+
+
+def test_export_todos_json(client, sample_user, auth_headers, app, monkeypatch):
+    """Test the JSON export streams the same todos as the list endpoint."""
+    monkeypatch.setattr("api.TODO_EXPORT_BATCH_SIZE", 3)
+    for i in range(7):
+        client.post(
+            "/api/todos",
+            headers=auth_headers,
+            json={"title": f"Todo {i}", "importance": i % 4 + 1},
+        )
+
+    response = client.get("/api/todos/export", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.mimetype == "application/json"
+    listed = client.get("/api/todos", headers=auth_headers).get_json()["todos"]
+    assert response.get_json() == {"todos": listed}
+
+
+def test_export_todos_empty(client, auth_headers):
+    """Test exporting no todos yields a valid empty document."""
+    response = client.get("/api/todos/export", headers=auth_headers)
+    assert response.get_json() == {"todos": []}
+
+
+def test_export_todos_ndjson_filtered(
+    client, sample_user, auth_headers, app, monkeypatch
+):
+    """Test NDJSON export writes one todo per line and applies filters."""
+    monkeypatch.setattr("api.TODO_EXPORT_BATCH_SIZE", 1)
+    _seed_filter_todos(app)
+
+    response = client.get(
+        "/api/todos/export?format=ndjson&status=pending,in_progress&view=compact",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    lines = response.get_data(as_text=True).splitlines()
+    todos = [json.loads(line) for line in lines]
+    assert [todo["title"] for todo in todos] == [
+        "In progress",
+        "Pending high",
+        "Pending low",
+    ]
+    assert "owner" not in todos[0]
+
+
+@pytest.mark.parametrize("query", ["format=csv", "status=unknown", "view=tiny"])
+def test_export_todos_invalid(client, auth_headers, query):
+    """Test export parameters are validated before streaming starts."""
+    response = client.get(f"/api/todos/export?{query}", headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_export_todos_unauthorized(client):
+    """Test export requires authentication."""
+    response = client.get("/api/todos/export")
+    assert response.status_code == 401
+
+
+# ============================================================================
+# GET /api/todos/sync - Delta sync
+# ============================================================================
+
+
+def test_sync_todos_full_then_delta(client, sample_user, auth_headers, monkeypatch):
+    """Test a sync returns only changes and deletions since the last one."""
+    monkeypatch.setattr("api.TODO_SYNC_OVERLAP", timedelta(0))
+    ids = [
+        client.post(
+            "/api/todos", headers=auth_headers, json={"title": title}
+        ).get_json()["todo"]["id"]
+        for title in ("Kept", "Edited", "Deleted", "Batch deleted")
+    ]
+
+    response = client.get("/api/todos/sync", headers=auth_headers)
+    assert response.status_code == 200
+    full = response.get_json()
+    assert [todo["id"] for todo in full["todos"]] == ids
+    assert full["deleted"] == []
+
+    client.patch(
+        f"/api/todos/{ids[1]}", headers=auth_headers, json={"status": "completed"}
+    )
+    client.delete(f"/api/todos/{ids[2]}", headers=auth_headers)
+    client.post(
+        "/api/todos/batch",
+        headers=auth_headers,
+        json={"operations": [{"op": "delete", "id": ids[3]}]},
+    )
+    created = client.post("/api/todos", headers=auth_headers, json={"title": "New"})
+
+    delta = client.get(
+        f"/api/todos/sync?sync_token={full['sync_token']}", headers=auth_headers
+    ).get_json()
+    assert [todo["id"] for todo in delta["todos"]] == [
+        ids[1],
+        created.get_json()["todo"]["id"],
+    ]
+    assert delta["todos"][0]["status"] == "completed"
+    assert delta["deleted"] == [ids[2], ids[3]]
+
+    unchanged = client.get(
+        f"/api/todos/sync?sync_token={delta['sync_token']}", headers=auth_headers
+    ).get_json()
+    assert unchanged["todos"] == []
+    assert unchanged["deleted"] == []
+
+
+def test_sync_todos_overlap_repeats_recent_changes(client, auth_headers):
+    """Test changes just before the sync point are sent again."""
+    client.post("/api/todos", headers=auth_headers, json={"title": "Recent"})
+    token = client.get("/api/todos/sync", headers=auth_headers).get_json()["sync_token"]
+
+    response = client.get(f"/api/todos/sync?sync_token={token}", headers=auth_headers)
+    assert [todo["title"] for todo in response.get_json()["todos"]] == ["Recent"]
+
+
+def test_sync_todos_since_only_own(client, sample_user, auth_headers, app):
+    """Test syncing from a timestamp returns the user's own changes only."""
+    with app.app_context():
+        other = User(email="other@example.com", username="otheruser")
+        other.set_password("password123")
+        db.session.add(other)
+        db.session.flush()
+        db.session.add(Todo(title="Not mine", owner_id=other.id))
+        db.session.add(
+            TodoTombstone(
+                todo_id=999, owner_id=other.id, deleted_at=datetime.now(timezone.utc)
+            )
+        )
+        db.session.commit()
+    client.post("/api/todos", headers=auth_headers, json={"title": "Mine"})
+
+    since = (datetime.now(timezone.utc) - timedelta(minutes=1)).isoformat()
+    data = client.get(
+        "/api/todos/sync", headers=auth_headers, query_string={"since": since}
+    ).get_json()
+    assert [todo["title"] for todo in data["todos"]] == ["Mine"]
+    assert data["deleted"] == []
+
+
+def test_sync_todos_expired_sync_point(client, auth_headers):
+    """Test a sync point older than the tombstone retention is refused."""
+    response = client.get(
+        "/api/todos/sync?since=2000-01-01T00:00:00Z", headers=auth_headers
+    )
+    assert response.status_code == 410
+
+
+def test_sync_todos_token_from_old_changes_not_expired(
+    client, sample_user, auth_headers, app
+):
+    """Test a token from a sync whose newest change is past retention still works."""
+    long_ago = datetime.now(timezone.utc) - timedelta(days=40)
+    with app.app_context():
+        db.session.add(
+            Todo(
+                title="Old",
+                owner_id=sample_user.id,
+                created_at=long_ago,
+                updated_at=long_ago,
+            )
+        )
+        db.session.commit()
+
+    token = client.get("/api/todos/sync", headers=auth_headers).get_json()["sync_token"]
+    response = client.get(f"/api/todos/sync?sync_token={token}", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.get_json()["todos"] == []
+
+    token = response.get_json()["sync_token"]
+    response = client.get(f"/api/todos/sync?sync_token={token}", headers=auth_headers)
+    assert response.status_code == 200
+
+
+def test_sync_todos_offset_aware_sync_token(client, auth_headers):
+    """Test a sync token with a UTC offset is accepted like a naive one."""
+    client.post("/api/todos", headers=auth_headers, json={"title": "Recent"})
+    since = (datetime.now(timezone.utc) - timedelta(minutes=1)).isoformat()
+    token = _encode_raw_cursor({"since": since})
+
+    response = client.get(f"/api/todos/sync?sync_token={token}", headers=auth_headers)
+    assert response.status_code == 200
+    assert [todo["title"] for todo in response.get_json()["todos"]] == ["Recent"]
+
+
+def test_delete_todo_prunes_expired_tombstones(client, sample_user, auth_headers, app):
+    """Test deleting prunes tombstones past the retention period."""
+    with app.app_context():
+        db.session.add(
+            TodoTombstone(
+                todo_id=999,
+                owner_id=sample_user.id,
+                deleted_at=datetime.now(timezone.utc) - timedelta(days=365),
+            )
+        )
+        db.session.commit()
+    todo = client.post("/api/todos", headers=auth_headers, json={"title": "Gone"})
+    todo_id = todo.get_json()["todo"]["id"]
+
+    client.delete(f"/api/todos/{todo_id}", headers=auth_headers)
+
+    with app.app_context():
+        assert [t.todo_id for t in TodoTombstone.query.all()] == [todo_id]
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "sync_token=not-a-token",
+        "since=yesterday",
+        "since=2026-01-01T00:00:00&sync_token=abc",
+        "view=tiny",
+    ],
+)
+def test_sync_todos_invalid(client, auth_headers, query):
+    """Test malformed sync parameters are rejected."""
+    response = client.get(f"/api/todos/sync?{query}", headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_sync_todos_unauthorized(client):
+    """Test sync requires authentication."""
+    response = client.get("/api/todos/sync")
+    assert response.status_code == 401
@@ -265,6 +265,29 @@ describe("ApiClient", () => {
         })
       );
     });
+    it("sends the last-write marker back on later requests", async () => {
+      mockFetch.mockResolvedValueOnce({
+        ok: true,
+        headers: {
+          get: (name: string) => (name === "X-Last-Write" ? "marker" : null),
+        },
+        json: async () => ({ todo: {} }),
+      } as unknown as Response);
+      mockFetch.mockResolvedValueOnce({
+        ok: true,
+        json: async () => ({ todos: [] }),
+      } as Response);
+
+      await client.createTodo({ title: "New Todo" });
+      await client.getTodos();
+
+      expect(mockFetch).toHaveBeenLastCalledWith(
+        "http://test-api.com/api/todos",
+        expect.objectContaining({
+          headers: expect.objectContaining({ "X-Last-Write": "marker" }),
+        })
+      );
+    });
   });
 
   describe("updateTodo", () => {
@@ -14,9 +14,14 @@ import type {
   User,
 } from "./types";
 
+// Marker the backend returns after a write; sending it back keeps this
+// client's reads on the primary database until the replicas catch up
+const LAST_WRITE_HEADER = "X-Last-Write";
+
 export class ApiClient {
   private baseUrl: string;
   private token: string | null = null;
+  private lastWrite: string | null = null;
 
   constructor(baseUrl: string = "http://localhost:5000") {
     this.baseUrl = baseUrl;
@@ -85,11 +90,20 @@ export class ApiClient {
       headers["Authorization"] = `Bearer ${this.token}`;
     }
 
+    if (this.lastWrite !== null) {
+      headers[LAST_WRITE_HEADER] = this.lastWrite;
+    }
+
     const response = await fetch(`${this.baseUrl}${endpoint}`, {
       ...options,
       headers,
     });
 
+    const lastWrite = response.headers?.get(LAST_WRITE_HEADER);
+    if (lastWrite) {
+      this.lastWrite = lastWrite;
+    }
+
     if (!response.ok) {
       const error = (await response.json()) as ApiError;
       throw new Error(error.error || "Request failed");
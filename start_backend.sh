@@ -1,6 +1,14 @@
 #!/bin/bash
 set -e
 
+# Usage: ./start_backend.sh [--production]
+#   --production  Serve with Gunicorn (multi-process, multi-threaded) instead
+#                 of the Flask development server
+PRODUCTION=false
+if [ "$1" = "--production" ]; then
+    PRODUCTION=true
+fi
+
 echo "Starting backend server..."
 
 # Check if virtual environment exists
@@ -42,9 +50,29 @@ else
     echo "Generated new SECRET_KEY for this session"
 fi
 
-# Initialize database if needed
-echo "Initializing database..."
-python -c "from app import app, db; app.app_context().push(); db.create_all()" 2>/dev/null || true
+# Bring the schema up to date (see backend/migrations)
+echo "Applying database migrations..."
+# A database created with db.create_all() has at least the initial schema
+# but no recorded revision; mark it so the upgrade builds on it (revisions
+# skip what it already has)
+SCHEMA_STATE=$(python -c '
+from sqlalchemy import inspect
+from api import app
+from models import db
+with app.app_context():
+    tables = inspect(db.engine).get_table_names()
+print("unversioned" if "todos" in tables and "alembic_version" not in tables else "ok")
+')
+if [ "$SCHEMA_STATE" = "unversioned" ]; then
+    alembic stamp 0001
+fi
+alembic upgrade head
+
+if [ "$PRODUCTION" = true ]; then
+    # Worker/thread counts etc. come from GUNICORN_* variables, see gunicorn_config.py
+    echo "Starting Gunicorn on http://localhost:5000"
+    exec gunicorn -c gunicorn_config.py api:app
+fi
 
 # Start Flask server
 echo "Starting Flask on http://localhost:5000"